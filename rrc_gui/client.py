@@ -46,6 +46,10 @@ from .envelope import make_envelope, validate_envelope
 
 logger = logging.getLogger(__name__)
 
+# Cached DEBUG gate for per-packet logging; LogManager refreshes it whenever
+# the log level changes.
+_DEBUG_ENABLED = logger.isEnabledFor(logging.DEBUG)
+
 
 class MessageTooLargeError(RuntimeError):
     """Raised when message exceeds link MDU."""
@@ -112,8 +116,10 @@ class Client:
 
         self.nickname = nickname
 
+        # link and rooms are replaced, never mutated, under _lock so that
+        # readers can load them without taking the lock.
         self.link: RNS.Link | None = None
-        self.rooms: set[str] = set()
+        self.rooms: frozenset[str] = frozenset()
 
         self._lock = threading.RLock()
         self._welcomed = threading.Event()
@@ -216,9 +222,8 @@ class Client:
             attempts = 0
 
             while time.monotonic() < deadline and not self._welcomed.is_set():
-                with self._lock:
-                    if self.link is not link:
-                        return
+                if self.link is not link:
+                    return
 
                 now = time.monotonic()
                 if attempts < max_attempts and now >= next_send:
@@ -292,7 +297,7 @@ class Client:
                     return
                     
                 self.link = None
-                self.rooms.clear()
+                self.rooms = frozenset()
                 active_resources = list(self._active_resources)
                 self._resource_expectations.clear()
                 self._active_resources.clear()
@@ -412,7 +417,7 @@ class Client:
         with self._lock:
             link = self.link
             self.link = None
-            self.rooms.clear()
+            self.rooms = frozenset()
             self._resource_expectations.clear()
 
             active_resources = list(self._active_resources)
@@ -460,7 +465,7 @@ class Client:
             )
         self._send(make_envelope(T_PART, src=self.identity.hash, room=r))
         with self._lock:
-            self.rooms.discard(r)
+            self.rooms = self.rooms - {r}
 
     def msg(self, room: str, text: str) -> bytes:
         if not isinstance(room, str):
@@ -734,8 +739,7 @@ class Client:
                 logger.exception("Unexpected error processing MOTD resource: %s", e)
 
     def _send(self, env: dict) -> None:
-        with self._lock:
-            link = self.link
+        link = self.link
         if link is None:
             raise RuntimeError(
                 "Not connected to hub. Call connect() with a valid hub hash before sending messages."
@@ -769,7 +773,8 @@ class Client:
             return
 
         t = env.get(K_T)
-        logger.debug("Received packet type: %s", t)
+        if _DEBUG_ENABLED:
+            logger.debug("Received packet type: %s", t)
 
         if t == T_PING:
             body = env.get(K_BODY)
@@ -865,7 +870,7 @@ class Client:
             if isinstance(room, str) and room:
                 r = room.strip().lower()
                 with self._lock:
-                    self.rooms.add(r)
+                    self.rooms = self.rooms | {r}
                 if self.on_joined:
                     try:
                         self.on_joined(r, env)
@@ -880,7 +885,7 @@ class Client:
             if isinstance(room, str) and room:
                 r = room.strip().lower()
                 with self._lock:
-                    self.rooms.discard(r)
+                    self.rooms = self.rooms - {r}
                 if self.on_parted:
                     try:
                         self.on_parted(r, env)
@@ -901,7 +906,8 @@ class Client:
             return
 
         if t == T_NOTICE:
-            logger.debug("Received T_NOTICE")
+            if _DEBUG_ENABLED:
+                logger.debug("Received T_NOTICE")
             if self.on_notice:
                 try:
                     self.on_notice(env)
@@ -4,17 +4,18 @@ from __future__ import annotations
 
 import json
 import logging
+import math
 import os
 import sys
 import threading
 import time
-from datetime import datetime
+from collections import Counter, deque
+from functools import partial
 from pathlib import Path
 
 import cbor2
 import RNS
 import wx
-import wx.richtext
 
 from .client import Client, ClientConfig, parse_hash
 from .config import load_config, save_config
@@ -35,7 +36,7 @@ from .dialogs import (
     RestartDialog,
 )
 from .state import StateManager
-from .theme import get_theme_colors
+from .theme import get_theme_colors, invalidate_theme_cache
 from .ui_constants import (
     BUTTON_WIDTH,
     CONNECTION_TIMEOUT,
@@ -43,13 +44,21 @@ from .ui_constants import (
     INPUT_HISTORY_SIZE,
     MAX_MESSAGE_LENGTH,
     MAX_MESSAGES_PER_ROOM,
+    PENDING_CHECK_INTERVAL_MS,
     PENDING_MESSAGE_TIMEOUT,
     RATE_LIMIT_MESSAGES_PER_MINUTE,
     RATE_LIMIT_WARNING_THRESHOLD,
     ROOM_LIST_WIDTH,
+    STATUS_UPDATE_INTERVAL_MS,
+    USER_LIST_REFRESH_DELAY_MS,
     USER_LIST_WIDTH,
 )
-from .utils import load_or_create_identity, normalize_room_name, sanitize_display_name
+from .utils import (
+    get_timestamp,
+    load_or_create_identity,
+    normalize_room_name,
+    sanitize_display_name,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -57,13 +66,82 @@ STALE_HUB_THRESHOLD_SECONDS = 3600
 MAX_ANNOUNCE_DATA_SIZE = 10240
 MAX_TIMESTAMP_SKEW_SECONDS = 300
 
+# One housekeeping timer drives both the status bar and the pending sweep.
+_UI_TICK_MS = math.gcd(PENDING_CHECK_INTERVAL_MS, STATUS_UPDATE_INTERVAL_MS)
+_PENDING_CHECK_TICKS = PENDING_CHECK_INTERVAL_MS // _UI_TICK_MS
+_STATUS_UPDATE_TICKS = STATUS_UPDATE_INTERVAL_MS // _UI_TICK_MS
+
+
+# Status bar prefixes: disconnected, connecting, connected.
+_STATUS_PREFIXES = ("🔴 Not connected", "🟡 Connecting...", "🟢 Connected")
+
+# System message templates
+_TPL_WELCOME = "[%s] *** WELCOME - Connected to hub%s ***\n"
+_TPL_GREETING = "[%s] *** %s\n"
+_TPL_JOINED = "[%s] *** JOINED %s (%d user%s) ***\n"
+_TPL_PARTED = "[%s] *** PARTED %s ***\n"
+_TPL_MEMBER_JOINED = "[%s] *** %s joined %s ***\n"
+_TPL_MEMBER_LEFT = "[%s] *** %s left %s ***\n"
+_TPL_DISCONNECTED = "[%s] *** DISCONNECTED ***\n"
+_TPL_FAILED = "[%s] [%s] %s: %s [FAILED - not delivered]\n"
+
+# Hub error bodies that are expected during normal operation (e.g. HELLO
+# retries) and are not shown to the user.
+_IGNORED_ERROR_BODIES = frozenset({"HELLO already sent"})
+
+# Cached _format_user labels kept before the cache is reset.
+_USER_LABEL_CACHE_SIZE = 1024
+
+# Per-event JOIN/PART debug logging; flip on when tracing membership issues.
+_DEBUG_EVENTS = False
+
+# Packed message style: bold and italic flags in the low bits, the index
+# into MainFrame._color_table above them.
+_STYLE_BOLD = 1
+_STYLE_ITALIC = 2
+_STYLE_COLOR_SHIFT = 2
+
 _load_config = load_config
 _save_config = save_config
 _get_theme_colors = get_theme_colors
+_get_timestamp = get_timestamp
 _load_or_create_identity = load_or_create_identity
 _normalize_room_name = normalize_room_name
 
 
+class RoomHistory:
+    """Bounded message history for one room, stored column-wise.
+
+    Line texts and packed styles live in parallel deques instead of one
+    tuple per line; styles are small ints, which Python shares, so a line
+    costs little more than its text. Appending to a full history evicts
+    the oldest line.
+    """
+
+    __slots__ = ("texts", "styles")
+
+    def __init__(self, maxlen: int = MAX_MESSAGES_PER_ROOM):
+        self.texts: deque[str] = deque(maxlen=maxlen)
+        self.styles: deque[int] = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def is_full(self) -> bool:
+        """Return True if the next append will evict the oldest line."""
+        return len(self.texts) == self.texts.maxlen
+
+    def append(self, text: str, style: int):
+        """Add a line to the end of the history."""
+        self.texts.append(text)
+        self.styles.append(style)
+
+    def replace(self, index: int, text: str, style: int):
+        """Overwrite the line at index."""
+        self.texts[index] = text
+        self.styles[index] = style
+
+
 class HubAnnounceHandler:
     """Handler for RRC hub announcements on the Reticulum network."""
 
@@ -149,6 +227,71 @@ class HubAnnounceHandler:
             logger.exception(f"Error processing announcement: {e}")
 
 
+class _ChatState:
+    """Per-session chat state held by MainFrame.
+
+    wx.Frame subclasses cannot declare __slots__, so the frequently read
+    connection and room state lives on this slotted companion object.
+    """
+
+    __slots__ = (
+        "room_messages",
+        "room_users",
+        "pending_messages",
+        "pending_index",
+        "active_room",
+        "own_identity_hash",
+        "own_identity_bytes",
+        "client",
+        "is_connecting",
+    )
+
+    def __init__(self):
+        self.room_messages: dict[str, RoomHistory] = {}
+        self.room_users: dict[str, set[bytes]] = {}
+        self.pending_messages: dict[bytes, tuple[str, str, float]] = {}
+        # room -> message id -> index of its placeholder in room_messages[room]
+        self.pending_index: dict[str, dict[bytes, int]] = {}
+        self.active_room: str | None = None
+        self.own_identity_hash: str | None = None
+        self.own_identity_bytes: bytes | None = None
+        self.client: Client | None = None
+        self.is_connecting: bool = False
+
+
+class _VirtualListCtrl(wx.ListCtrl):
+    """Single-column, headerless virtual list backed by a list of strings.
+
+    Rows are fetched through OnGetItemText only when they are painted, so
+    the native control holds no per-item state.
+    """
+
+    def __init__(self, parent: wx.Window, size: tuple[int, int]):
+        super().__init__(
+            parent,
+            size=size,
+            style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_NO_HEADER | wx.LC_SINGLE_SEL,
+        )
+        self._items: list[str] = []
+        self.InsertColumn(0, "")
+        self.Bind(wx.EVT_SIZE, self._on_size)
+
+    def Set(self, items: list[str]):
+        """Replace all rows."""
+        self._items = items
+        self.SetItemCount(len(items))
+        self.Refresh()
+
+    def OnGetItemText(self, item: int, column: int) -> str:
+        """Return the text of a row for wx to paint."""
+        return self._items[item]
+
+    def _on_size(self, event):
+        """Keep the single column as wide as the control."""
+        event.Skip()
+        self.SetColumnWidth(0, self.GetClientSize().GetWidth())
+
+
 class MainFrame(wx.Frame):
     """Main chat window."""
 
@@ -157,33 +300,51 @@ class MainFrame(wx.Frame):
 
         self.state_manager = StateManager()
 
-        theme_colors = get_theme_colors()
-        self.COLOR_OWN_MESSAGE = theme_colors["own_message"]
-        self.COLOR_NOTICE = theme_colors["notice"]
-        self.COLOR_ERROR = theme_colors["error"]
-        self.COLOR_SYSTEM = theme_colors["system"]
-        self.client: Client | None = None
-        self.active_room: str | None = None
-        self.nickname_map: dict[str, str] = {}
-        self.own_identity_hash: str | None = None
+        self._theme_colors: dict | None = None
+        # Colors referenced by packed message styles. Slot 0 is "no color";
+        # the theme roles follow, so a theme change recolors stored history.
+        self._color_table: list[wx.Colour | None] = [None]
+        self._update_theme_colors()
+        self.state = _ChatState()
+        self.nickname_map: dict[bytes, str] = {}
+        # identity bytes -> _format_user label; reset when nicknames change
+        self._user_labels: dict[bytes, str] = {}
         self.current_configdir: str | None = None
-        self.is_connecting: bool = False
-        self.pending_messages: dict[bytes, tuple[str, str, float, int | None]] = {}
-        self.room_messages: dict[
-            str, list[tuple[str, wx.Colour | None, bool, bool]]
-        ] = {}
         self.HUB_ROOM = "[Hub]"
-        self.room_messages[self.HUB_ROOM] = []
-        self.room_users: dict[str, set[str]] = {}
-        self.unread_counts: dict[str, int] = {}
-        self.message_send_times: list[float] = []
-        self.input_history: list[str] = []
+        self.state.room_messages[self.HUB_ROOM] = RoomHistory()
+        self._userlist_dirty: bool = False
+        self._roomlist_dirty: bool = False
+        self._rendered_users: list[str] = []
+        self._rooms_ordered: list[str] = []
+        # room name -> row in room_list; kept in step with _rooms_ordered
+        self._room_index: dict[str, int] = {}
+        self._pending_appends: list[tuple[str, wx.Colour | None, bool, bool]] = []
+        self._flush_scheduled: bool = False
+        self._scroll_pending: bool = False
+        self._controls_enabled: bool | None = None
+        # Display position of each written line, and the display index of
+        # active-room history entry 0 (None when the two are out of sync).
+        self._display_starts: list[int] = []
+        self._display_offset: int | None = 0
+        self._config_dialog_open: bool = False
+        self.unread_counts: Counter[str] = Counter()
+        self.message_send_times: deque[float] = deque()
+        self.input_history: deque[str] = deque(maxlen=INPUT_HISTORY_SIZE)
         self.input_history_index: int = -1
         self.input_buffer: str = ""
 
         self.last_ping_time: float | None = None
         self.latency_ms: int | None = None
 
+        self._command_handlers = {
+            "/join": self._cmd_join,
+            "/part": self._cmd_part,
+            "/nick": self._cmd_nick,
+            "/ping": self._cmd_ping,
+            "/help": self._cmd_help,
+            "/?": self._cmd_help,
+        }
+
         self.room_operation_times: dict[str, list[float]] = {}
         self.room_op_rate_limit = 10
         self.room_op_rate_window = 5.0
@@ -202,6 +363,10 @@ class MainFrame(wx.Frame):
         if window_state.get("maximized"):
             self.Maximize()
 
+        # Build the widget tree frozen so it is laid out and painted once.
+        # Nothing is shown yet, so a failure here needs no Thaw.
+        self.Freeze()
+
         self._create_menu_bar()
 
         panel = wx.Panel(self)
@@ -213,9 +378,9 @@ class MainFrame(wx.Frame):
         left_box.Add(room_label, flag=wx.ALL, border=DEFAULT_BORDER)
         self.room_list = wx.ListBox(panel, size=(ROOM_LIST_WIDTH, -1))
         self.room_list.Bind(wx.EVT_LISTBOX, self.on_room_select)
-        self.room_list.Append(self.HUB_ROOM)
+        self._append_room_entry(self.HUB_ROOM)
         self.room_list.SetSelection(0)
-        self.active_room = self.HUB_ROOM
+        self.state.active_room = self.HUB_ROOM
         left_box.Add(
             self.room_list, proportion=1, flag=wx.EXPAND | wx.ALL, border=DEFAULT_BORDER
         )
@@ -236,9 +401,14 @@ class MainFrame(wx.Frame):
         self.active_room_label = wx.StaticText(panel, label="Active room: [Hub]")
         right_box.Add(self.active_room_label, flag=wx.ALL, border=DEFAULT_BORDER)
 
-        self.message_display = wx.richtext.RichTextCtrl(
+        # Deferred so importing this module doesn't load the richtext extension.
+        from wx.richtext import RichTextCtrl
+
+        self.message_display = RichTextCtrl(
             panel, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_WORDWRAP
         )
+        # Read-only log: never record undo actions for the text we write.
+        self.message_display.BeginSuppressUndo()
         right_box.Add(
             self.message_display,
             proportion=1,
@@ -258,42 +428,51 @@ class MainFrame(wx.Frame):
 
         main_sizer.Add(right_box, proportion=1, flag=wx.EXPAND)
 
-        self.users_outer_box = wx.BoxSizer(wx.VERTICAL)
-        self.users_panel = wx.Panel(panel)
-        users_box = wx.BoxSizer(wx.VERTICAL)
-        users_label = wx.StaticText(self.users_panel, label="Users:")
-        users_box.Add(users_label, flag=wx.ALL, border=DEFAULT_BORDER)
-        self.users_list = wx.ListBox(self.users_panel, size=(USER_LIST_WIDTH, -1))
-        users_box.Add(
-            self.users_list,
-            proportion=1,
-            flag=wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM,
-            border=DEFAULT_BORDER,
-        )
-        self.users_panel.SetSizer(users_box)
-        self.users_outer_box.Add(self.users_panel, proportion=1, flag=wx.EXPAND)
-
-        self.users_panel.Hide()
-        self.users_panel_in_sizer = False
+        self.main_panel = panel
+        # The user list column is built the first time a room is shown,
+        # then stays in the sizer and is only shown or hidden.
+        self.users_outer_box: wx.BoxSizer | None = None
+        self.users_panel: wx.Panel | None = None
+        self.users_list: _VirtualListCtrl | None = None
+        self.users_panel_shown = False
 
         panel.SetSizer(main_sizer)
+        panel.Layout()
+        self.Thaw()
 
+        self._last_status_state: tuple | None = None
+        self._last_status_text: str | None = None
         self.CreateStatusBar()
-        self.SetStatusText("Not connected")
+        self._set_status_text("Not connected")
 
         self._set_controls_enabled(False)
 
         self.Bind(wx.EVT_CLOSE, self.on_close)
 
         self.Bind(wx.EVT_CHAR_HOOK, self.on_key_press)
+        self.Bind(wx.EVT_SYS_COLOUR_CHANGED, self.on_sys_colour_changed)
 
-        self.pending_check_timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self._check_pending_timeouts, self.pending_check_timer)
-        self.pending_check_timer.Start(5000)
+        self._ui_tick = 0
+        self.ui_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self._on_ui_timer, self.ui_timer)
 
-        self.status_update_timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self._update_status_display, self.status_update_timer)
-        self.status_update_timer.Start(1000)
+    def _create_users_panel(self):
+        """Build the user list column and add it to the main sizer."""
+        self.users_outer_box = wx.BoxSizer(wx.VERTICAL)
+        self.users_panel = wx.Panel(self.main_panel)
+        users_box = wx.BoxSizer(wx.VERTICAL)
+        users_label = wx.StaticText(self.users_panel, label="Users:")
+        users_box.Add(users_label, flag=wx.ALL, border=DEFAULT_BORDER)
+        self.users_list = _VirtualListCtrl(self.users_panel, size=(USER_LIST_WIDTH, -1))
+        users_box.Add(
+            self.users_list,
+            proportion=1,
+            flag=wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM,
+            border=DEFAULT_BORDER,
+        )
+        self.users_panel.SetSizer(users_box)
+        self.users_outer_box.Add(self.users_panel, proportion=1, flag=wx.EXPAND)
+        self.main_panel.GetSizer().Add(self.users_outer_box, flag=wx.EXPAND)
 
     def _initialize_reticulum(self):
         """Initialize Reticulum at startup."""
@@ -429,7 +608,7 @@ class MainFrame(wx.Frame):
 
     def _on_connection_success(self):
         """Handle successful connection."""
-        self.is_connecting = False
+        self.state.is_connecting = False
         self._update_status_display()
         self._set_controls_enabled(True)
         self.connect_menu_item.Enable(False)
@@ -437,65 +616,71 @@ class MainFrame(wx.Frame):
 
     def _on_connection_failed(self, error_msg: str):
         """Handle connection failure."""
-        self.is_connecting = False
-        self.client = None
+        self.state.is_connecting = False
+        self.state.client = None
         self._update_status_display()
         self.connect_menu_item.Enable(True)
         self.disconnect_menu_item.Enable(False)
         wx.MessageBox(error_msg, "Connection Error", wx.OK | wx.ICON_ERROR)
 
+    def _set_status_text(self, text: str):
+        """Show free-form status text, invalidating the cached status state."""
+        self._last_status_state = None
+        self._last_status_text = text
+        self.SetStatusText(text)
+
     def _update_status_display(self, event=None):
         """Update status bar with connection state and pending message count."""
-        if self.is_connecting:
-            icon = "🟡"
-            status = "Connecting..."
-        elif self.client:
-            icon = "🟢"
-            status = "Connected"
-        else:
-            icon = "🔴"
-            status = "Not connected"
+        state = self.state
+        connecting = state.is_connecting
+        connected = bool(state.client)
+        pending_count = len(state.pending_messages)
+        status_state = (connecting, connected, pending_count, self.latency_ms)
+        if status_state == self._last_status_state:
+            return
+        self._last_status_state = status_state
+
+        text = _STATUS_PREFIXES[1 if connecting else (2 if connected else 0)]
 
-        pending_count = len(self.pending_messages)
         if pending_count > 0:
-            status += f" | Sending: {pending_count}"
+            text += f" | Sending: {pending_count}"
 
-        if self.latency_ms is not None and self.client:
-            status += f" | {self.latency_ms}ms"
+        if self.latency_ms is not None and connected:
+            text += f" | {self.latency_ms}ms"
 
-        self.SetStatusText(f"{icon} {status}")
+        if text != self._last_status_text:
+            self._last_status_text = text
+            self.SetStatusText(text)
 
     def on_input_key_down(self, event):
         """Handle input history navigation with up/down arrows."""
         keycode = event.GetKeyCode()
+        history = self.input_history
+        entry = self.message_input
 
         if keycode == wx.WXK_UP:
-            if self.input_history:
+            if history:
                 if self.input_history_index == -1:
-                    self.input_buffer = self.message_input.GetValue()
-                    self.input_history_index = len(self.input_history) - 1
+                    self.input_buffer = entry.GetValue()
+                    self.input_history_index = len(history) - 1
                 elif self.input_history_index > 0:
                     self.input_history_index -= 1
 
-                if 0 <= self.input_history_index < len(self.input_history):
-                    self.message_input.SetValue(
-                        self.input_history[self.input_history_index]
-                    )
-                    self.message_input.SetInsertionPointEnd()
+                if 0 <= self.input_history_index < len(history):
+                    entry.SetValue(history[self.input_history_index])
+                    entry.SetInsertionPointEnd()
             return
 
         elif keycode == wx.WXK_DOWN:
             if self.input_history_index != -1:
-                if self.input_history_index < len(self.input_history) - 1:
+                if self.input_history_index < len(history) - 1:
                     self.input_history_index += 1
-                    self.message_input.SetValue(
-                        self.input_history[self.input_history_index]
-                    )
-                    self.message_input.SetInsertionPointEnd()
+                    entry.SetValue(history[self.input_history_index])
+                    entry.SetInsertionPointEnd()
                 else:
                     self.input_history_index = -1
-                    self.message_input.SetValue(self.input_buffer)
-                    self.message_input.SetInsertionPointEnd()
+                    entry.SetValue(self.input_buffer)
+                    entry.SetInsertionPointEnd()
             return
 
         event.Skip()
@@ -504,12 +689,13 @@ class MainFrame(wx.Frame):
         """Handle keyboard shortcuts."""
         keycode = event.GetKeyCode()
 
+        rooms = self._rooms_ordered
+
         if event.AltDown() and ord("1") <= keycode <= ord("9"):
             room_index = keycode - ord("1")
-            if room_index < self.room_list.GetCount():
+            if room_index < len(rooms):
                 self.room_list.SetSelection(room_index)
-                room = self.room_list.GetString(room_index)
-                self._set_active_room(room)
+                self._set_active_room(rooms[room_index])
             return
 
         if event.AltDown():
@@ -517,83 +703,160 @@ class MainFrame(wx.Frame):
                 current = self.room_list.GetSelection()
                 if current > 0:
                     self.room_list.SetSelection(current - 1)
-                    room = self.room_list.GetString(current - 1)
-                    self._set_active_room(room)
+                    self._set_active_room(rooms[current - 1])
                 return
             elif keycode == wx.WXK_DOWN:
                 current = self.room_list.GetSelection()
-                if current < self.room_list.GetCount() - 1:
+                if current < len(rooms) - 1:
                     self.room_list.SetSelection(current + 1)
-                    room = self.room_list.GetString(current + 1)
-                    self._set_active_room(room)
+                    self._set_active_room(rooms[current + 1])
                 return
 
         event.Skip()
 
-    def _check_pending_timeouts(self, event):
+    def _wake_ui_timer(self):
+        """Start the housekeeping timer if it is not already running."""
+        if not self.ui_timer.IsRunning():
+            self._ui_tick = 0
+            self.ui_timer.Start(_UI_TICK_MS)
+
+    def _on_ui_timer(self, event):
+        """Dispatch housekeeping work on its own cadence from a single timer."""
+        self._ui_tick += 1
+        if self._ui_tick % _STATUS_UPDATE_TICKS == 0:
+            self._update_status_display()
+        if self._ui_tick % _PENDING_CHECK_TICKS == 0:
+            self._check_pending_timeouts()
+
+        # Status changes are pushed as they happen; only pending messages
+        # need polling, so let the process sleep when nothing is in flight.
+        if not self.state.pending_messages:
+            self.ui_timer.Stop()
+
+    def _check_pending_timeouts(self, event=None):
         """Check for pending messages that have timed out and mark them as failed."""
-        if not self.pending_messages:
+        if not self.state.pending_messages:
             return
 
-        current_time = time.time()
-        timed_out = []
+        current_time = time.monotonic()
+        pending = self.state.pending_messages
+        timed_out = 0
+        # Shared by every message failed in this sweep; formatted on first use.
+        timestamp: str | None = None
+        user = ""
 
-        for mid, (room, text, sent_time, index) in list(self.pending_messages.items()):
+        for mid, (room, text, sent_time) in list(pending.items()):
             if current_time - sent_time <= PENDING_MESSAGE_TIMEOUT:
                 continue
-            timed_out.append(mid)
+            del pending[mid]
+            timed_out += 1
 
-            if room not in self.room_messages:
+            message_index = self._take_pending_placeholder(room, mid, text)
+            if message_index is None:
                 continue
+            messages = self.state.room_messages[room]
+
+            if timestamp is None:
+                timestamp = _get_timestamp()
+                user = (
+                    self._format_user(self.state.own_identity_bytes)
+                    if self.state.own_identity_hash
+                    else "you"
+                )
+            messages.replace(
+                message_index,
+                _TPL_FAILED % (timestamp, room, user, text),
+                self._encode_style(self.COLOR_ERROR, False, True),
+            )
+            self._rewrite_message(room, message_index)
 
-            messages = self.room_messages[room]
-            message_index: int | None = None
-            if isinstance(index, int) and 0 <= index < len(messages):
-                msg_text, msg_color, _msg_bold, msg_italic = messages[index]
-                if msg_italic and msg_color == self.COLOR_SYSTEM and text in msg_text:
-                    message_index = index
-            if message_index is None:
-                for i in range(len(messages) - 1, -1, -1):
-                    msg_text, msg_color, _msg_bold, msg_italic = messages[i]
-                    if (
-                        msg_italic
-                        and msg_color == self.COLOR_SYSTEM
-                        and text in msg_text
-                    ):
-                        message_index = i
-                        break
+        if timed_out:
+            self._update_status_display()
 
-            if message_index is None:
-                continue
+    def _take_pending_placeholder(self, room: str, mid: bytes, text: str) -> int | None:
+        """Pop the history index of a pending message's placeholder.
 
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            user = (
-                self._format_user(bytes.fromhex(self.own_identity_hash))
-                if self.own_identity_hash
-                else "you"
-            )
-            messages[message_index] = (
-                f"[{timestamp}] [{room}] {user}: {text} [FAILED - not delivered]\n",
-                self.COLOR_ERROR,
-                False,
-                True,
-            )
-            if room == self.active_room:
-                self._reload_room_messages()
+        The recorded index is used when it still points at the placeholder;
+        the backwards scan over the room only runs if it does not.
 
-        for mid in timed_out:
-            self.pending_messages.pop(mid, None)
+        Returns:
+            Index into room_messages[room], or None if it was trimmed away
+        """
+        room_index = self.state.pending_index.get(room)
+        index = room_index.pop(mid, None) if room_index is not None else None
+        messages = self.state.room_messages.get(room)
+        if index is None or not messages:
+            return None
+
+        # Placeholders are system-colored italic lines, bold or not.
+        placeholder_style = self._encode_style(self.COLOR_SYSTEM, False, True)
+        texts = messages.texts
+        styles = messages.styles
+
+        def is_placeholder(i: int) -> bool:
+            return styles[i] & ~_STYLE_BOLD == placeholder_style and text in texts[i]
+
+        if index < len(messages) and is_placeholder(index):
+            return index
+        for i in range(len(messages) - 1, -1, -1):
+            if is_placeholder(i):
+                return i
+        return None
+
+    def _update_theme_colors(self) -> bool:
+        """Update color constants based on current theme.
 
-    def _update_theme_colors(self):
-        """Update color constants based on current theme."""
+        Returns:
+            True if the theme colors changed, False otherwise
+        """
         theme_colors = _get_theme_colors()
+        if theme_colors == self._theme_colors:
+            return False
+        self._theme_colors = theme_colors
         self.COLOR_OWN_MESSAGE = theme_colors["own_message"]
         self.COLOR_NOTICE = theme_colors["notice"]
         self.COLOR_ERROR = theme_colors["error"]
         self.COLOR_SYSTEM = theme_colors["system"]
+        self._color_table[1:5] = [
+            self.COLOR_OWN_MESSAGE,
+            self.COLOR_NOTICE,
+            self.COLOR_ERROR,
+            self.COLOR_SYSTEM,
+        ]
+        self._sysmsg = partial(
+            self._append_styled_message, color=self.COLOR_SYSTEM, italic=True
+        )
+        return True
+
+    def _encode_style(self, color: wx.Colour | None, bold: bool, italic: bool) -> int:
+        """Pack a message style into an int for RoomHistory."""
+        table = self._color_table
+        for i, entry in enumerate(table):
+            if entry is color:
+                color_index = i
+                break
+        else:
+            color_index = len(table)
+            table.append(color)
+        return (
+            color_index << _STYLE_COLOR_SHIFT
+            | (_STYLE_BOLD if bold else 0)
+            | (_STYLE_ITALIC if italic else 0)
+        )
+
+    def _decode_style(self, style: int) -> tuple[wx.Colour | None, bool, bool]:
+        """Unpack a RoomHistory style into (color, bold, italic)."""
+        return (
+            self._color_table[style >> _STYLE_COLOR_SHIFT],
+            bool(style & _STYLE_BOLD),
+            bool(style & _STYLE_ITALIC),
+        )
 
     def _set_controls_enabled(self, enabled: bool):
         """Enable/disable controls based on connection state."""
+        if self._controls_enabled == enabled:
+            return
+        self._controls_enabled = enabled
         self.room_list.Enable(enabled)
         self.join_btn.Enable(enabled)
         self.part_btn.Enable(enabled)
@@ -605,21 +868,43 @@ class MainFrame(wx.Frame):
         if not isinstance(src, (bytes, bytearray)):
             return str(src)
 
-        src_hex_full = src.hex()
-        src_hex_short = src_hex_full[:12]
-
-        if self.own_identity_hash and src_hex_full == self.own_identity_hash:
-            own_nick = self.nickname_map.get(src_hex_full, "")
+        key = bytes(src)
+        labels = self._user_labels
+        label = labels.get(key)
+        if label is None:
+            if len(labels) >= _USER_LABEL_CACHE_SIZE:
+                labels.clear()
+            label = labels[key] = self._build_user_label(key)
+        return label
+
+    def _build_user_label(self, src: bytes) -> str:
+        """Build the display label for an identity; see _format_user."""
+        src_hex_short = src[:6].hex()
+
+        if src == self.state.own_identity_bytes:
+            own_nick = self.nickname_map.get(src, "")
             if own_nick:
                 return f"{own_nick} (you)"
             return f"{src_hex_short}… (you)"
 
-        nick: str | None = self.nickname_map.get(src_hex_full)
+        nick: str | None = self.nickname_map.get(src)
         if nick:
             return f"{nick} <{src_hex_short}…>"
 
         return f"{src_hex_short}…"
 
+    def _set_nickname(self, user_hash: bytes, nick: str) -> bool:
+        """Record a user's nickname, invalidating cached labels if it changed.
+
+        Returns:
+            True if the nickname was new or different
+        """
+        if self.nickname_map.get(user_hash) == nick:
+            return False
+        self.nickname_map[user_hash] = nick
+        self._user_labels.clear()
+        return True
+
     def _append_styled_message(
         self,
         text: str,
@@ -629,80 +914,148 @@ class MainFrame(wx.Frame):
         room: str | None = None,
     ) -> int:
         """Append text to message display with styling and store in room history."""
-        target_room = room or self.active_room or self.HUB_ROOM
-
-        if target_room not in self.room_messages:
-            self.room_messages[target_room] = []
-
-        self.room_messages[target_room].append((text, color, bold, italic))
-        appended_index = len(self.room_messages[target_room]) - 1
-
-        if target_room != self.active_room and target_room != self.HUB_ROOM:
-            self.unread_counts[target_room] = self.unread_counts.get(target_room, 0) + 1
-            wx.CallAfter(self._update_room_list_display)
-
-        if len(self.room_messages[target_room]) > MAX_MESSAGES_PER_ROOM:
-            dropped = len(self.room_messages[target_room]) - MAX_MESSAGES_PER_ROOM
-            self.room_messages[target_room] = self.room_messages[target_room][
-                -MAX_MESSAGES_PER_ROOM:
-            ]
-            appended_index = max(0, appended_index - dropped)
-
-            if self.pending_messages and dropped > 0:
-                for mid, (
-                    pending_room,
-                    pending_text,
-                    pending_sent,
-                    pending_index,
-                ) in list(self.pending_messages.items()):
-                    if pending_room != target_room:
-                        continue
-                    if pending_index is None:
-                        continue
-                    new_index = pending_index - dropped
-                    self.pending_messages[mid] = (
-                        pending_room,
-                        pending_text,
-                        pending_sent,
-                        new_index if new_index >= 0 else None,
-                    )
-
-        if target_room != self.active_room:
+        state = self.state
+        target_room = room or state.active_room or self.HUB_ROOM
+        is_active = target_room == state.active_room
+
+        messages = state.room_messages.get(target_room)
+        if messages is None:
+            messages = state.room_messages[target_room] = RoomHistory()
+        # A full history evicts its oldest entry on append.
+        trimmed = messages.is_full()
+        messages.append(text, self._encode_style(color, bold, italic))
+        if trimmed:
+            self._trim_room(target_room, is_active)
+        appended_index = len(messages) - 1
+
+        if not is_active and target_room != self.HUB_ROOM:
+            self._increment_unread(target_room)
+
+        if not is_active:
             return appended_index
 
-        if not self.IsShown() or self.message_display.GetSize().GetWidth() <= 0:
-            return appended_index
+        self._pending_appends.append((text, color, bold, italic))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            wx.CallAfter(self._flush_appends)
+
+        return appended_index
 
-        self.message_display.MoveEnd()
+    def _trim_room(self, room: str, is_active: bool):
+        """Shift bookkeeping after a room's oldest history entry was evicted."""
+        if is_active and self._display_offset is not None:
+            # The display keeps trimmed lines until the next reload.
+            self._display_offset += 1
+
+        room_pending = self.state.pending_index.get(room)
+        if room_pending:
+            for mid, index in list(room_pending.items()):
+                if index == 0:
+                    del room_pending[mid]
+                else:
+                    room_pending[mid] = index - 1
 
-        attr = wx.richtext.RichTextAttr()
-        if color:
-            attr.SetTextColour(color)
-        if bold:
-            attr.SetFontWeight(wx.FONTWEIGHT_BOLD)
-        if italic:
-            attr.SetFontStyle(wx.FONTSTYLE_ITALIC)
+    def _write_styled(
+        self, text: str, color: wx.Colour | None, bold: bool, italic: bool
+    ):
+        """Write one styled run at the message display's insertion point."""
+        display = self.message_display
 
         if color:
-            self.message_display.BeginTextColour(color)
+            display.BeginTextColour(color)
         if bold:
-            self.message_display.BeginBold()
+            display.BeginBold()
         if italic:
-            self.message_display.BeginItalic()
+            display.BeginItalic()
 
-        self.message_display.WriteText(text)
+        display.WriteText(text)
 
         if italic:
-            self.message_display.EndItalic()
+            display.EndItalic()
         if bold:
-            self.message_display.EndBold()
+            display.EndBold()
         if color:
-            self.message_display.EndTextColour()
+            display.EndTextColour()
+
+    def _flush_appends(self):
+        """Write all queued active-room messages to the display in one batch."""
+        self._flush_scheduled = False
+        queued = self._pending_appends
+        if not queued:
+            return
+        self._pending_appends = []
 
-        self.message_display.MoveEnd()
-        self.message_display.ShowPosition(self.message_display.GetLastPosition())
+        if not self.IsShown() or self.message_display.GetSize().GetWidth() <= 0:
+            self._display_offset = None
+            return
 
-        return appended_index
+        display = self.message_display
+        starts = self._display_starts
+        display.Freeze()
+        try:
+            display.MoveEnd()
+            for text, color, bold, italic in queued:
+                starts.append(display.GetLastPosition())
+                self._write_styled(text, color, bold, italic)
+        finally:
+            display.Thaw()
+
+        self._schedule_scroll_to_end()
+
+    def _schedule_scroll_to_end(self):
+        """Scroll the message display to the end once the current burst is done."""
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            wx.CallAfter(self._scroll_to_end)
+
+    def _scroll_to_end(self):
+        """Show the last line of the message display."""
+        self._scroll_pending = False
+        display = self.message_display
+        display.ShowPosition(display.GetLastPosition())
+
+    def _rewrite_message(self, room: str, index: int):
+        """Redraw one history entry of the active room in place.
+
+        Only the entry's own character range is replaced; the rest of the
+        display is left alone. Falls back to a full reload if the display
+        is not known to mirror the room history.
+        """
+        if room != self.state.active_room:
+            return
+
+        self._flush_appends()
+        starts = self._display_starts
+        if self._display_offset is None:
+            self._reload_room_messages()
+            return
+        display_index = self._display_offset + index
+        if display_index >= len(starts):
+            self._reload_room_messages()
+            return
+
+        history = self.state.room_messages[room]
+        text = history.texts[index]
+        color, bold, italic = self._decode_style(history.styles[index])
+        display = self.message_display
+        start = starts[display_index]
+        if display_index + 1 < len(starts):
+            end = starts[display_index + 1]
+        else:
+            end = display.GetLastPosition()
+
+        display.Freeze()
+        try:
+            display.Remove(start, end)
+            display.SetInsertionPoint(start)
+            self._write_styled(text, color, bold, italic)
+            delta = display.GetInsertionPoint() - end
+        finally:
+            display.Thaw()
+
+        if delta:
+            for i in range(display_index + 1, len(starts)):
+                starts[i] += delta
 
     def on_discovered_hubs(self, event):
         """Show discovered hubs dialog."""
@@ -738,7 +1091,7 @@ class MainFrame(wx.Frame):
 
             _save_config(values)
 
-            self.is_connecting = True
+            self.state.is_connecting = True
             self._update_status_display()
             self.connect_menu_item.Enable(False)
 
@@ -749,9 +1102,9 @@ class MainFrame(wx.Frame):
                     "Reticulum Error",
                     wx.OK | wx.ICON_ERROR,
                 )
-                self.is_connecting = False
+                self.state.is_connecting = False
                 self.connect_menu_item.Enable(True)
-                self.SetStatusText("Not connected")
+                self._set_status_text("Not connected")
                 return
 
             configdir = values.get("configdir") or None
@@ -764,8 +1117,9 @@ class MainFrame(wx.Frame):
                     "Config Directory Mismatch",
                     wx.OK | wx.ICON_WARNING,
                 )
-                self.is_connecting = False
+                self.state.is_connecting = False
                 self.connect_menu_item.Enable(True)
+                self._set_status_text("Not connected")
                 return
 
             thread = threading.Thread(
@@ -777,7 +1131,7 @@ class MainFrame(wx.Frame):
 
     def on_connect_menu(self, event):
         """Show connection dialog and connect to hub."""
-        if self.client or self.is_connecting:
+        if self.state.client or self.state.is_connecting:
             return
 
         dlg = ConnectionDialog(self)
@@ -792,7 +1146,7 @@ class MainFrame(wx.Frame):
 
             _save_config(values)
 
-            self.is_connecting = True
+            self.state.is_connecting = True
             self._update_status_display()
             self.connect_menu_item.Enable(False)
 
@@ -803,9 +1157,9 @@ class MainFrame(wx.Frame):
                     "Reticulum Error",
                     wx.OK | wx.ICON_ERROR,
                 )
-                self.is_connecting = False
+                self.state.is_connecting = False
                 self.connect_menu_item.Enable(True)
-                self.SetStatusText("Not connected")
+                self._set_status_text("Not connected")
                 return
 
             configdir = values.get("configdir") or None
@@ -818,8 +1172,9 @@ class MainFrame(wx.Frame):
                     "Config Directory Mismatch",
                     wx.OK | wx.ICON_WARNING,
                 )
-                self.is_connecting = False
+                self.state.is_connecting = False
                 self.connect_menu_item.Enable(True)
+                self._set_status_text("Not connected")
                 return
 
             thread = threading.Thread(
@@ -833,7 +1188,7 @@ class MainFrame(wx.Frame):
         """Connect to the hub (runs in background thread)."""
         try:
             print(f"[DEBUG] _connect_thread started with values: {values.keys()}")
-            wx.CallAfter(self.SetStatusText, "Connecting...")
+            wx.CallAfter(self._set_status_text, "Connecting...")
 
             if RNS.Reticulum.get_instance() is None:
                 print("[DEBUG] ERROR: Reticulum not initialized")
@@ -847,7 +1202,8 @@ class MainFrame(wx.Frame):
             identity = _load_or_create_identity(values["identity_path"])
             print(f"[DEBUG] Identity loaded: {identity.hash.hex()[:16]}...")
 
-            own_identity_hash = identity.hash.hex()
+            own_identity_bytes = bytes(identity.hash)
+            own_identity_hash = own_identity_bytes.hex()
             nickname = values.get("nickname", "")
             if nickname:
                 print(f"[DEBUG] Set nickname: {nickname}")
@@ -885,10 +1241,12 @@ class MainFrame(wx.Frame):
             auto_join_room = values.get("auto_join_room", "")
 
             def _commit_connection() -> None:
-                self.client = client
-                self.own_identity_hash = own_identity_hash
+                self.state.client = client
+                self.state.own_identity_hash = own_identity_hash
+                self.state.own_identity_bytes = own_identity_bytes
+                self._user_labels.clear()
                 if nickname:
-                    self.nickname_map[own_identity_hash] = nickname
+                    self._set_nickname(own_identity_bytes, nickname)
 
                 self._on_connection_success()
 
@@ -913,25 +1271,29 @@ class MainFrame(wx.Frame):
 
     def on_disconnect_menu(self, event):
         """Disconnect from hub."""
-        if self.client:
+        if self.state.client:
             try:
-                self.client.close()
+                self.state.client.close()
             except Exception:
                 pass
 
-            self.client = None
-            self.is_connecting = False
-            self.pending_messages.clear()
+            self.state.client = None
+            self.state.is_connecting = False
+            self.state.pending_messages.clear()
+            self.state.pending_index.clear()
             self.nickname_map.clear()
-            self.own_identity_hash = None
-            self.room_list.Clear()
-            self.room_list.Append(self.HUB_ROOM)
+            self._user_labels.clear()
+            self.state.own_identity_hash = None
+            self.state.own_identity_bytes = None
+            self._reset_room_entries()
             self.room_list.SetSelection(0)
-            hub_msgs = self.room_messages.get(self.HUB_ROOM, [])
-            self.room_messages.clear()
-            self.room_messages[self.HUB_ROOM] = hub_msgs
-            self.room_users.clear()
-            self._set_active_room(self.HUB_ROOM)
+            hub_msgs = self.state.room_messages.get(self.HUB_ROOM)
+            if hub_msgs is None:
+                hub_msgs = RoomHistory()
+            self.state.room_messages.clear()
+            self.state.room_messages[self.HUB_ROOM] = hub_msgs
+            self.state.room_users.clear()
+            self._set_active_room(self.HUB_ROOM, force=True)
             self._set_controls_enabled(False)
             self._update_status_display()
             self.connect_menu_item.Enable(True)
@@ -939,34 +1301,31 @@ class MainFrame(wx.Frame):
 
     def on_configuration(self, event):
         """Show configuration dialog."""
+        if self._config_dialog_open:
+            return
+        self._config_dialog_open = True
         dlg = ConfigurationDialog(self)
-        if dlg.ShowModal() == wx.ID_OK:
-            theme_colors = _get_theme_colors()
-            self.COLOR_OWN_MESSAGE = theme_colors["own_message"]
-            self.COLOR_NOTICE = theme_colors["notice"]
-            self.COLOR_ERROR = theme_colors["error"]
-            self.COLOR_SYSTEM = theme_colors["system"]
-
-            if self.active_room:
-                self._reload_room_messages()
-
-            if dlg.requires_restart():
-                restart_dlg = RestartDialog(self)
-                result = restart_dlg.ShowModal()
-                restart_dlg.Destroy()
-
-                if result == wx.ID_YES:
-                    self._restart_application()
-        dlg.Destroy()
+        try:
+            if dlg.ShowModal() == wx.ID_OK:
+                if self._update_theme_colors() and self.state.active_room:
+                    self._reload_room_messages()
+
+                if dlg.requires_restart():
+                    restart_dlg = RestartDialog(self)
+                    result = restart_dlg.ShowModal()
+                    restart_dlg.Destroy()
+
+                    if result == wx.ID_YES:
+                        self._restart_application()
+        finally:
+            dlg.Destroy()
+            self._config_dialog_open = False
 
     def _restart_application(self):
         """Restart the application."""
-        if hasattr(self, "pending_check_timer"):
-            if self.pending_check_timer and self.pending_check_timer.IsRunning():
-                self.pending_check_timer.Stop()
-        if hasattr(self, "status_update_timer"):
-            if self.status_update_timer and self.status_update_timer.IsRunning():
-                self.status_update_timer.Stop()
+        if hasattr(self, "ui_timer"):
+            if self.ui_timer and self.ui_timer.IsRunning():
+                self.ui_timer.Stop()
 
         pos = self.GetPosition()
         size = self.GetSize()
@@ -977,8 +1336,13 @@ class MainFrame(wx.Frame):
             maximized=is_maximized,
         )
 
-        if self.active_room and self.input_history:
-            self.state_manager.save_input_history(self.active_room, self.input_history)
+        if self.state.active_room and self.input_history:
+            self.state_manager.save_input_history(
+                self.state.active_room, list(self.input_history)
+            )
+
+        # execl skips atexit hooks; flush buffered log records ourselves.
+        logging.shutdown()
 
         python = sys.executable
         os.execl(python, python, *sys.argv)
@@ -987,14 +1351,18 @@ class MainFrame(wx.Frame):
         """Quit the application."""
         self.Close()
 
+    def on_sys_colour_changed(self, event):
+        """Pick up a system theme change and recolor the message display."""
+        event.Skip()
+        invalidate_theme_cache()
+        if self._update_theme_colors():
+            self._reload_room_messages()
+
     def on_close(self, event):
         """Handle window close."""
-        if hasattr(self, "pending_check_timer"):
-            if self.pending_check_timer and self.pending_check_timer.IsRunning():
-                self.pending_check_timer.Stop()
-        if hasattr(self, "status_update_timer"):
-            if self.status_update_timer and self.status_update_timer.IsRunning():
-                self.status_update_timer.Stop()
+        if hasattr(self, "ui_timer"):
+            if self.ui_timer and self.ui_timer.IsRunning():
+                self.ui_timer.Stop()
 
         pos = self.GetPosition()
         size = self.GetSize()
@@ -1005,61 +1373,67 @@ class MainFrame(wx.Frame):
             maximized=is_maximized,
         )
 
-        if self.active_room and self.input_history:
-            self.state_manager.save_input_history(self.active_room, self.input_history)
+        if self.state.active_room and self.input_history:
+            self.state_manager.save_input_history(
+                self.state.active_room, list(self.input_history)
+            )
 
-        if self.client:
-            self.client.close()
+        if self.state.client:
+            self.state.client.close()
         self.Destroy()
 
     def on_room_select(self, event):
         """Handle room selection from list."""
         sel = self.room_list.GetSelection()
         if sel != wx.NOT_FOUND:
-            room = self.room_list.GetString(sel)
-            self._set_active_room(room)
+            self._set_active_room(self._rooms_ordered[sel])
 
-    def _set_active_room(self, room: str):
-        """Set the active room for sending messages and update display."""
-        if self.active_room and self.input_history:
-            config = _load_config()
-            if config.get("save_input_history", True):
-                self.state_manager.save_input_history(
-                    self.active_room, self.input_history
-                )
+    def _set_active_room(self, room: str, force: bool = False):
+        """Set the active room for sending messages and update display.
 
-        self.active_room = room
-        self.active_room_label.SetLabel(f"Active room: {room}")
+        Args:
+            room: Room to activate
+            force: Re-apply the room even if it is already active
+        """
+        if room == self.state.active_room and not force:
+            return
 
         config = _load_config()
-        if config.get("save_input_history", True):
-            self.input_history = self.state_manager.get_input_history(room)
+        save_history = config.get("save_input_history", True)
+
+        if self.state.active_room and self.input_history and save_history:
+            self.state_manager.save_input_history(
+                self.state.active_room, list(self.input_history)
+            )
+
+        self.state.active_room = room
+        self.active_room_label.SetLabel(f"Active room: {room}")
+
+        max_history = config.get("input_history_size", INPUT_HISTORY_SIZE)
+        if save_history:
+            self.input_history = deque(
+                self.state_manager.get_input_history(room), maxlen=max_history
+            )
         else:
-            self.input_history = []
+            self.input_history = deque(maxlen=max_history)
         self.input_history_index = -1
         self.input_buffer = ""
 
-        if room in self.unread_counts:
-            self.unread_counts[room] = 0
+        if self._clear_unread(room):
             self._update_room_list_display()
 
-        idx = self.room_list.FindString(room)
-        if idx != wx.NOT_FOUND:
+        idx = self._room_index.get(room)
+        if idx is not None:
             self.room_list.SetSelection(idx)
 
-        panel = self.users_panel.GetParent()
-        main_sizer = panel.GetSizer()
-
-        if room == self.HUB_ROOM:
-            if self.users_panel_in_sizer:
-                main_sizer.Detach(self.users_outer_box)
-                self.users_panel.Hide()
-                self.users_panel_in_sizer = False
-        else:
-            if not self.users_panel_in_sizer:
-                main_sizer.Add(self.users_outer_box, flag=wx.EXPAND)
-                self.users_panel.Show()
-                self.users_panel_in_sizer = True
+        panel = self.main_panel
+        show_users = room != self.HUB_ROOM
+        if show_users != self.users_panel_shown:
+            if self.users_outer_box is None:
+                self._create_users_panel()
+            else:
+                panel.GetSizer().Show(self.users_outer_box, show_users)
+            self.users_panel_shown = show_users
 
         panel.Layout()
 
@@ -1067,100 +1441,194 @@ class MainFrame(wx.Frame):
 
     def _reload_room_messages(self):
         """Reload the message display with current room's history."""
+        # Queued appends are already in the history being reloaded.
+        self._pending_appends.clear()
+        self._display_starts = []
+        self._display_offset = None
+
         if not self.IsShown() or self.message_display.GetSize().GetWidth() <= 0:
             return
 
-        self.message_display.Clear()
+        room = self.state.active_room or self.HUB_ROOM
+        messages = self.state.room_messages.get(room) or RoomHistory(0)
+
+        # Consecutive lines with the same style are written as one run.
+        display = self.message_display
+        starts = self._display_starts
+        end = 0
+        run: list[str] = []
+        run_style = -1
+        display.Freeze()
+        try:
+            display.Clear()
+            for text, style in zip(messages.texts, messages.styles, strict=True):
+                if style != run_style:
+                    if run:
+                        self._write_styled("".join(run), *self._decode_style(run_style))
+                        run = []
+                    run_style = style
+                starts.append(end)
+                end += len(text)
+                run.append(text)
+            if run:
+                self._write_styled("".join(run), *self._decode_style(run_style))
+        finally:
+            display.Thaw()
+
+        # Line starts are derived from text lengths; only trust them for
+        # in-place rewrites if the control agrees on the total length.
+        self._display_offset = 0 if display.GetLastPosition() == end else None
+
+        self._schedule_scroll_to_end()
 
-        room = self.active_room or self.HUB_ROOM
-        messages = self.room_messages.get(room, [])
+        self._update_user_list()
 
-        for text, color, bold, italic in messages:
-            self.message_display.MoveEnd()
+    def _increment_unread(self, room: str):
+        """Count an unread message for a background room."""
+        self.unread_counts[room] += 1
+        if not self._roomlist_dirty:
+            self._roomlist_dirty = True
+            wx.CallAfter(self._update_room_list_display)
 
-            if color:
-                self.message_display.BeginTextColour(color)
-            if bold:
-                self.message_display.BeginBold()
-            if italic:
-                self.message_display.BeginItalic()
+    def _clear_unread(self, room: str) -> bool:
+        """Reset a room's unread count.
 
-            self.message_display.WriteText(text)
+        Returns:
+            True if the room had unread messages, False otherwise
+        """
+        return self.unread_counts.pop(room, 0) > 0
 
-            if italic:
-                self.message_display.EndItalic()
-            if bold:
-                self.message_display.EndBold()
-            if color:
-                self.message_display.EndTextColour()
+    def _append_room_entry(self, room: str):
+        """Add a room to the end of the room list."""
+        self._room_index[room] = len(self._rooms_ordered)
+        self._rooms_ordered.append(room)
+        self.room_list.Append(room)
 
-        self.message_display.MoveEnd()
-        self.message_display.ShowPosition(self.message_display.GetLastPosition())
+    def _delete_room_entry(self, room: str) -> int | None:
+        """Remove a room from the room list.
 
-        self._update_user_list()
+        Returns:
+            The row the room occupied, or None if it was not listed
+        """
+        idx = self._room_index.pop(room, None)
+        if idx is None:
+            return None
+        self.room_list.Delete(idx)
+        rooms = self._rooms_ordered
+        del rooms[idx]
+        for i in range(idx, len(rooms)):
+            self._room_index[rooms[i]] = i
+        return idx
+
+    def _reset_room_entries(self):
+        """Reset the room list to just the hub."""
+        self.room_list.Clear()
+        self.room_list.Append(self.HUB_ROOM)
+        self._rooms_ordered[:] = [self.HUB_ROOM]
+        self._room_index = {self.HUB_ROOM: 0}
 
     def _update_room_list_display(self):
-        """Update room list with unread message indicators."""
-        current_sel = self.room_list.GetSelection()
-        current_room = (
-            self.room_list.GetString(current_sel)
-            if current_sel != wx.NOT_FOUND
-            else None
-        )
+        """Update room list with unread message indicators.
 
-        rooms = [self.room_list.GetString(i) for i in range(self.room_list.GetCount())]
-        self.room_list.Clear()
+        Only rows whose label changed are rewritten, so the selection and
+        scroll position are kept; nothing is touched if no label changed.
+        """
+        self._roomlist_dirty = False
+        room_list = self.room_list
+        unread_counts = self.unread_counts
+        if not unread_counts:
+            desired = list(self._rooms_ordered)
+        else:
+            active_room = self.state.active_room
+            desired = []
+            for room in self._rooms_ordered:
+                unread = unread_counts[room]
+                if unread > 0 and room != active_room:
+                    desired.append(f"{room} ({unread})")
+                else:
+                    desired.append(room)
 
-        for room in rooms:
-            clean_room = room.split(" (")[0] if " (" in room else room
+        if room_list.GetStrings() == desired:
+            return
 
-            unread = self.unread_counts.get(clean_room, 0)
-            if unread > 0 and clean_room != self.active_room:
-                display = f"{clean_room} ({unread})"
-            else:
-                display = clean_room
+        room_list.Freeze()
+        try:
+            if room_list.GetCount() != len(desired):
+                current_sel = room_list.GetSelection()
+                room_list.Set(desired)
+                if current_sel != wx.NOT_FOUND and current_sel < len(desired):
+                    room_list.SetSelection(current_sel)
+                return
 
-            self.room_list.Append(display)
+            for i, display in enumerate(desired):
+                if room_list.GetString(i) != display:
+                    room_list.SetString(i, display)
+        finally:
+            room_list.Thaw()
 
-        if current_room:
-            for i in range(self.room_list.GetCount()):
-                if self.room_list.GetString(i).startswith(current_room.split(" (")[0]):
-                    self.room_list.SetSelection(i)
-                    break
+    def _mark_userlist_dirty(self):
+        """Schedule a user list refresh, coalescing bursts into one rebuild.
 
-    def _update_user_list(self):
-        """Update the user list for the active room."""
-        self.users_list.Clear()
+        The refresh runs USER_LIST_REFRESH_DELAY_MS after the first change,
+        so a stream of JOINs spread over several event loop turns still
+        redraws the list once.
+        """
+        if self._userlist_dirty:
+            return
+        self._userlist_dirty = True
+        wx.CallLater(USER_LIST_REFRESH_DELAY_MS, self._maybe_refresh_userlist)
 
-        room = self.active_room
-        if not room or room == self.HUB_ROOM:
+    def _maybe_refresh_userlist(self):
+        """Rebuild the user list if a refresh is still pending."""
+        if not self._userlist_dirty:
             return
+        self._userlist_dirty = False
+        self._update_user_list()
+
+    def _update_user_list(self):
+        """Update the user list for the active room.
 
-        users = self.room_users.get(room, set())
-        if not users:
+        The virtual list's rows are only swapped in with Set() when the
+        rendered rows differ from what is already displayed.
+        """
+        users_list = self.users_list
+        if users_list is None:
             return
 
-        user_entries = []
-        for user_hash in users:
-            nick = self.nickname_map.get(user_hash)
-            if nick:
-                display = f"{nick} <{user_hash[:12]}…>"
-            else:
-                display = f"{user_hash[:12]}…"
+        state = self.state
+        room = state.active_room
+        displays: list[str] = []
+        if room and room != self.HUB_ROOM:
+            nickname_get = self.nickname_map.get
+            own_bytes = state.own_identity_bytes
+            append = displays.append
+            for user_hash in state.room_users.get(room, ()):
+                nick = nickname_get(user_hash)
+                if nick:
+                    display = f"{nick} <{user_hash[:6].hex()}…>"
+                else:
+                    display = f"{user_hash[:6].hex()}…"
 
-            if user_hash == self.own_identity_hash:
-                display += " (you)"
+                if user_hash == own_bytes:
+                    display += " (you)"
 
-            user_entries.append((display, user_hash))
+                append(display)
 
-        user_entries.sort(key=lambda x: x[0].lower())
+            displays.sort(key=str.lower)
 
-        for display, _ in user_entries:
-            self.users_list.Append(display)
+        if displays == self._rendered_users:
+            return
+        self._rendered_users = displays
+
+        users_list.Freeze()
+        try:
+            users_list.Set(displays)
+        finally:
+            users_list.Thaw()
 
     def on_join_room(self, event):
         """Join a new room."""
-        if not self.client:
+        if not self.state.client:
             return
 
         dlg = wx.TextEntryDialog(self, "Enter room name:", "Join Room")
@@ -1180,25 +1648,25 @@ class MainFrame(wx.Frame):
 
             room = _normalize_room_name(raw_room)
             if room:
-                if self.room_list.FindString(room) != wx.NOT_FOUND:
+                if room in self._room_index:
                     wx.MessageBox(
                         f"Already in room '{room}'.",
                         "Already Joined",
                         wx.OK | wx.ICON_INFORMATION,
                     )
                 else:
-                    self.client.join(room)
+                    self.state.client.join(room)
         dlg.Destroy()
 
     def on_part_room(self, event):
         """Leave the active room."""
-        if not self.client or not self.active_room:
+        if not self.state.client or not self.state.active_room:
             return
 
-        if self.active_room == self.HUB_ROOM:
+        if self.state.active_room == self.HUB_ROOM:
             return
 
-        room_to_part = self.active_room
+        room_to_part = self.state.active_room
 
         result = wx.MessageBox(
             f"Leave room '{room_to_part}'?\n\nMessage history will be preserved.",
@@ -1207,11 +1675,12 @@ class MainFrame(wx.Frame):
         )
 
         if result == wx.YES:
-            self.client.part(room_to_part)
+            self.state.client.part(room_to_part)
 
     def on_send_message(self, event):
         """Send a message to the active room."""
-        if not self.client or not self.active_room:
+        state = self.state
+        if not state.client or not state.active_room:
             return
 
         text = self.message_input.GetValue().strip()
@@ -1223,7 +1692,7 @@ class MainFrame(wx.Frame):
             self.message_input.Clear()
             return
 
-        if self.active_room == self.HUB_ROOM:
+        if state.active_room == self.HUB_ROOM:
             wx.MessageBox(
                 "Cannot send messages to [Hub]. Join a room first or use /join <room>.",
                 "Hub Messages",
@@ -1231,10 +1700,10 @@ class MainFrame(wx.Frame):
             )
             return
 
-        current_time = time.time()
-        self.message_send_times = [
-            t for t in self.message_send_times if current_time - t < 60
-        ]
+        current_time = time.monotonic()
+        send_times = self.message_send_times
+        while send_times and current_time - send_times[0] >= 60:
+            send_times.popleft()
 
         if len(self.message_send_times) >= RATE_LIMIT_MESSAGES_PER_MINUTE:
             wx.MessageBox(
@@ -1243,10 +1712,12 @@ class MainFrame(wx.Frame):
                 wx.OK | wx.ICON_WARNING,
             )
             return
-        elif len(self.message_send_times) >= int(
+
+        rate_warning = len(self.message_send_times) >= int(
             RATE_LIMIT_MESSAGES_PER_MINUTE * RATE_LIMIT_WARNING_THRESHOLD
-        ):
-            self.SetStatusText(
+        )
+        if rate_warning:
+            self._set_status_text(
                 f"WARNING: Approaching rate limit ({len(self.message_send_times)}/{RATE_LIMIT_MESSAGES_PER_MINUTE} msgs/min)"
             )
 
@@ -1259,7 +1730,7 @@ class MainFrame(wx.Frame):
             return
 
         try:
-            mid = self.client.msg(self.active_room, text)
+            mid = state.client.msg(state.active_room, text)
         except Exception as e:
             if "MessageTooLargeError" not in str(type(e).__name__):
                 wx.MessageBox(
@@ -1269,35 +1740,30 @@ class MainFrame(wx.Frame):
                 )
             return
 
-        if self.own_identity_hash:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            send_time = time.time()
-            user = self._format_user(bytes.fromhex(self.own_identity_hash))
+        if state.own_identity_hash:
+            timestamp = _get_timestamp()
+            user = self._format_user(state.own_identity_bytes)
 
-            placeholder_index = self._append_styled_message(
-                f"[{timestamp}] [{self.active_room}] {user}: {text}\n",
-                color=self.COLOR_SYSTEM,
-                italic=True,
-                room=self.active_room,
-            )
-            self.pending_messages[mid] = (
-                self.active_room,
-                text,
-                send_time,
-                placeholder_index,
+            placeholder_index = self._sysmsg(
+                f"[{timestamp}] [{state.active_room}] {user}: {text}\n",
+                room=state.active_room,
             )
+            state.pending_messages[mid] = (state.active_room, text, current_time)
+            state.pending_index.setdefault(state.active_room, {})[
+                mid
+            ] = placeholder_index
+            # Leave a rate limit warning up until the next status tick.
+            if not rate_warning:
+                self._update_status_display()
+            self._wake_ui_timer()
 
         if text not in self.input_history or self.input_history[-1] != text:
             self.input_history.append(text)
-            config = _load_config()
-            max_history = config.get("input_history_size", INPUT_HISTORY_SIZE)
-            if len(self.input_history) > max_history:
-                self.input_history.pop(0)
 
         self.input_history_index = -1
         self.input_buffer = ""
 
-        self.message_send_times.append(time.time())
+        self.message_send_times.append(current_time)
 
         self.message_input.Clear()
 
@@ -1310,20 +1776,19 @@ class MainFrame(wx.Frame):
         Returns:
             True if operation is allowed, False if rate limited
         """
-        now = time.time()
-        if operation_key not in self.room_operation_times:
-            self.room_operation_times[operation_key] = []
-
-        self.room_operation_times[operation_key] = [
+        now = time.monotonic()
+        window = self.room_op_rate_window
+        times = [
             t
-            for t in self.room_operation_times[operation_key]
-            if now - t < self.room_op_rate_window
+            for t in self.room_operation_times.get(operation_key, ())
+            if now - t < window
         ]
+        self.room_operation_times[operation_key] = times
 
-        if len(self.room_operation_times[operation_key]) >= self.room_op_rate_limit:
+        if len(times) >= self.room_op_rate_limit:
             return False
 
-        self.room_operation_times[operation_key].append(now)
+        times.append(now)
         return True
 
     def _handle_command(self, text: str):
@@ -1334,240 +1799,242 @@ class MainFrame(wx.Frame):
         """
         parts = text.split(maxsplit=1)
         cmd = parts[0].lower()
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = _get_timestamp()
 
-        if cmd == "/join":
-            if len(parts) < 2:
-                self._append_styled_message(
-                    f"[{timestamp}] Usage: /join <room>\n",
-                    color=self.COLOR_ERROR,
-                    room=self.active_room,
-                )
-                return
+        handler = self._command_handlers.get(cmd)
+        if handler is None:
+            self._forward_command(text, timestamp)
+        else:
+            handler(parts, timestamp)
 
-            room_name = parts[1].strip()
-            if " " in room_name:
-                wx.MessageBox(
-                    "Room names cannot contain spaces.\n\n"
-                    "Use hyphens (-) or underscores (_) instead.\n"
-                    "Example: 'test-2' or 'test_2'",
-                    "Invalid Room Name",
-                    wx.OK | wx.ICON_WARNING,
-                )
-                return
+    def _cmd_join(self, parts: list[str], timestamp: str):
+        """Handle /join <room>."""
+        if len(parts) < 2:
+            self._append_styled_message(
+                f"[{timestamp}] Usage: /join <room>\n",
+                color=self.COLOR_ERROR,
+                room=self.state.active_room,
+            )
+            return
 
-            room = _normalize_room_name(room_name)
-            if room:
-                if self.room_list.FindString(room) != wx.NOT_FOUND:
+        room_name = parts[1].strip()
+        if " " in room_name:
+            wx.MessageBox(
+                "Room names cannot contain spaces.\n\n"
+                "Use hyphens (-) or underscores (_) instead.\n"
+                "Example: 'test-2' or 'test_2'",
+                "Invalid Room Name",
+                wx.OK | wx.ICON_WARNING,
+            )
+            return
+
+        room = _normalize_room_name(room_name)
+        if room:
+            if room in self._room_index:
+                self._append_styled_message(
+                    f"[{timestamp}] Already in room '{room}'\n",
+                    color=self.COLOR_NOTICE,
+                    room=self.state.active_room,
+                )
+            else:
+                if not self._check_room_operation_rate_limit(f"join:{room}"):
                     self._append_styled_message(
-                        f"[{timestamp}] Already in room '{room}'\n",
-                        color=self.COLOR_NOTICE,
-                        room=self.active_room,
+                        f"[{timestamp}] Too many join requests. Please wait a moment.\n",
+                        color=self.COLOR_ERROR,
+                        room=self.state.active_room,
                     )
-                else:
-                    if not self._check_room_operation_rate_limit(f"join:{room}"):
-                        self._append_styled_message(
-                            f"[{timestamp}] Too many join requests. Please wait a moment.\n",
-                            color=self.COLOR_ERROR,
-                            room=self.active_room,
-                        )
-                        return
-
-                    if not self.client:
-                        return
+                    return
 
-                    try:
-                        self.client.join(room)
-                    except Exception as e:
-                        self._append_styled_message(
-                            f"[{timestamp}] Failed to join room: {e}\n",
-                            color=self.COLOR_ERROR,
-                            room=self.active_room,
-                        )
+                if not self.state.client:
+                    return
 
-        elif cmd == "/part":
-            if len(parts) > 1:
-                part_room: str | None = _normalize_room_name(parts[1].strip())
-            else:
-                part_room = (
-                    self.active_room if self.active_room != self.HUB_ROOM else None
-                )
+                try:
+                    self.state.client.join(room)
+                except Exception as e:
+                    self._append_styled_message(
+                        f"[{timestamp}] Failed to join room: {e}\n",
+                        color=self.COLOR_ERROR,
+                        room=self.state.active_room,
+                    )
 
-            if not part_room:
-                self._append_styled_message(
-                    f"[{timestamp}] Usage: /part [room] - specify a room or use from a room window\n",
-                    color=self.COLOR_ERROR,
-                    room=self.active_room,
-                )
-                return
+    def _cmd_part(self, parts: list[str], timestamp: str):
+        """Handle /part [room]."""
+        if len(parts) > 1:
+            part_room: str | None = _normalize_room_name(parts[1].strip())
+        else:
+            part_room = (
+                self.state.active_room
+                if self.state.active_room != self.HUB_ROOM
+                else None
+            )
 
-            if self.room_list.FindString(part_room) == wx.NOT_FOUND:
-                self._append_styled_message(
-                    f"[{timestamp}] Not in room '{part_room}'\n",
-                    color=self.COLOR_NOTICE,
-                    room=self.active_room,
-                )
-                return
+        if not part_room:
+            self._append_styled_message(
+                f"[{timestamp}] Usage: /part [room] - specify a room or use from a room window\n",
+                color=self.COLOR_ERROR,
+                room=self.state.active_room,
+            )
+            return
 
-            if not self._check_room_operation_rate_limit(f"part:{part_room}"):
-                self._append_styled_message(
-                    f"[{timestamp}] Too many part requests. Please wait a moment.\n",
-                    color=self.COLOR_ERROR,
-                    room=self.active_room,
-                )
-                return
+        if part_room not in self._room_index:
+            self._append_styled_message(
+                f"[{timestamp}] Not in room '{part_room}'\n",
+                color=self.COLOR_NOTICE,
+                room=self.state.active_room,
+            )
+            return
 
-            if not self.client:
-                return
+        if not self._check_room_operation_rate_limit(f"part:{part_room}"):
+            self._append_styled_message(
+                f"[{timestamp}] Too many part requests. Please wait a moment.\n",
+                color=self.COLOR_ERROR,
+                room=self.state.active_room,
+            )
+            return
 
-            try:
-                self.client.part(part_room)
-            except Exception as e:
-                self._append_styled_message(
-                    f"[{timestamp}] Failed to part room: {e}\n",
-                    color=self.COLOR_ERROR,
-                    room=self.active_room,
-                )
+        if not self.state.client:
+            return
 
-        elif cmd == "/nick":
-            if not self.client:
-                return
+        try:
+            self.state.client.part(part_room)
+        except Exception as e:
+            self._append_styled_message(
+                f"[{timestamp}] Failed to part room: {e}\n",
+                color=self.COLOR_ERROR,
+                room=self.state.active_room,
+            )
 
-            if len(parts) < 2:
-                current_nick = (
-                    self.client.nickname if self.client.nickname else "(not set)"
-                )
-                self._append_styled_message(
-                    f"[{timestamp}] Current nickname: {current_nick}\n"
-                    f"[{timestamp}] Usage: /nick <nickname> to change it\n",
-                    color=self.COLOR_SYSTEM,
-                    italic=True,
-                    room=self.active_room,
-                )
-                return
+    def _cmd_nick(self, parts: list[str], timestamp: str):
+        """Handle /nick [nickname]."""
+        if not self.state.client:
+            return
 
-            new_nick = parts[1].strip()
-            if len(new_nick) > 32:
-                self._append_styled_message(
-                    f"[{timestamp}] Nickname too long (max 32 characters)\n",
-                    color=self.COLOR_ERROR,
-                    room=self.active_room,
-                )
-                return
+        if len(parts) < 2:
+            current_nick = (
+                self.state.client.nickname
+                if self.state.client.nickname
+                else "(not set)"
+            )
+            self._sysmsg(
+                f"[{timestamp}] Current nickname: {current_nick}\n"
+                f"[{timestamp}] Usage: /nick <nickname> to change it\n",
+                room=self.state.active_room,
+            )
+            return
 
-            if not new_nick:
-                self._append_styled_message(
-                    f"[{timestamp}] Nickname cannot be empty\n",
-                    color=self.COLOR_ERROR,
-                    room=self.active_room,
-                )
-                return
+        new_nick = parts[1].strip()
+        if len(new_nick) > 32:
+            self._append_styled_message(
+                f"[{timestamp}] Nickname too long (max 32 characters)\n",
+                color=self.COLOR_ERROR,
+                room=self.state.active_room,
+            )
+            return
 
-            old_nick = self.client.nickname
-            self.client.nickname = new_nick
+        if not new_nick:
+            self._append_styled_message(
+                f"[{timestamp}] Nickname cannot be empty\n",
+                color=self.COLOR_ERROR,
+                room=self.state.active_room,
+            )
+            return
 
-            if self.own_identity_hash:
-                self.nickname_map[self.own_identity_hash] = new_nick
-                for room in self.room_users.keys():
-                    if self.active_room == room:
-                        wx.CallAfter(self._update_user_list)
+        old_nick = self.state.client.nickname
+        self.state.client.nickname = new_nick
 
-            config = _load_config()
-            config["nickname"] = new_nick
-            _save_config(config)
+        if self.state.own_identity_bytes:
+            self._set_nickname(self.state.own_identity_bytes, new_nick)
+            if self.state.active_room in self.state.room_users:
+                self._mark_userlist_dirty()
 
-            if old_nick:
-                self._append_styled_message(
-                    f"[{timestamp}] Nickname changed from '{old_nick}' to '{new_nick}'\n",
-                    color=self.COLOR_SYSTEM,
-                    italic=True,
-                    room=self.active_room,
-                )
-            else:
-                self._append_styled_message(
-                    f"[{timestamp}] Nickname set to '{new_nick}'\n",
-                    color=self.COLOR_SYSTEM,
-                    italic=True,
-                    room=self.active_room,
-                )
+        config = _load_config()
+        config["nickname"] = new_nick
+        _save_config(config)
 
-        elif cmd == "/ping":
-            if not self.client:
-                return
+        if old_nick:
+            self._sysmsg(
+                f"[{timestamp}] Nickname changed from '{old_nick}' to '{new_nick}'\n",
+                room=self.state.active_room,
+            )
+        else:
+            self._sysmsg(
+                f"[{timestamp}] Nickname set to '{new_nick}'\n",
+                room=self.state.active_room,
+            )
 
-            try:
-                self.last_ping_time = time.time()
-                self.client.ping()
-                self._append_styled_message(
-                    f"[{timestamp}] PING sent to hub\n",
-                    color=self.COLOR_SYSTEM,
-                    italic=True,
-                    room=self.active_room,
-                )
-            except Exception as e:
-                self.last_ping_time = None
-                self._append_styled_message(
-                    f"[{timestamp}] Failed to send PING: {e}\n",
-                    color=self.COLOR_ERROR,
-                    room=self.active_room,
-                )
+    def _cmd_ping(self, parts: list[str], timestamp: str):
+        """Handle /ping."""
+        if not self.state.client:
+            return
 
-        elif cmd in ("/help", "/?"):
-            help_text = (
-                f"[{timestamp}] Available commands:\n"
-                "  /join <room>  - Join a room\n"
-                "  /part [room]  - Leave current room or specified room\n"
-                "  /nick <name>  - Change your nickname\n"
-                "  /ping         - Send a PING to the hub\n"
-                "  /help or /?   - Show this help message\n"
+        try:
+            self.last_ping_time = time.monotonic()
+            self.state.client.ping()
+            self._sysmsg(
+                f"[{timestamp}] PING sent to hub\n", room=self.state.active_room
             )
+        except Exception as e:
+            self.last_ping_time = None
             self._append_styled_message(
-                help_text,
-                color=self.COLOR_SYSTEM,
-                italic=True,
-                room=self.active_room,
+                f"[{timestamp}] Failed to send PING: {e}\n",
+                color=self.COLOR_ERROR,
+                room=self.state.active_room,
             )
 
-        else:
-            if not self.client or not self.active_room:
-                return
+    def _cmd_help(self, parts: list[str], timestamp: str):
+        """Handle /help and /?."""
+        help_text = (
+            f"[{timestamp}] Available commands:\n"
+            "  /join <room>  - Join a room\n"
+            "  /part [room]  - Leave current room or specified room\n"
+            "  /nick <name>  - Change your nickname\n"
+            "  /ping         - Send a PING to the hub\n"
+            "  /help or /?   - Show this help message\n"
+        )
+        self._sysmsg(help_text, room=self.state.active_room)
 
-            try:
-                self.client.msg(self.active_room, text)
-                self._append_styled_message(
-                    f"[{timestamp}] > {text}\n",
-                    color=self.COLOR_SYSTEM,
-                    italic=True,
-                    room=self.active_room,
-                )
-            except Exception as e:
-                self._append_styled_message(
-                    f"[{timestamp}] Failed to send command: {e}\n",
-                    color=self.COLOR_ERROR,
-                    room=self.active_room,
-                )
+    def _forward_command(self, text: str, timestamp: str):
+        """Send an unrecognized command to the hub as a message."""
+        if not self.state.client or not self.state.active_room:
+            return
+
+        try:
+            self.state.client.msg(self.state.active_room, text)
+            self._sysmsg(f"[{timestamp}] > {text}\n", room=self.state.active_room)
+        except Exception as e:
+            self._append_styled_message(
+                f"[{timestamp}] Failed to send command: {e}\n",
+                color=self.COLOR_ERROR,
+                room=self.state.active_room,
+            )
 
     def _on_message(self, env: dict):
         """Handle incoming message."""
+        state = self.state
         room = env.get(K_ROOM, "?")
         src = env.get(K_SRC, b"")
         body = env.get(K_BODY, "")
 
         nick = env.get(K_NICK)
         if isinstance(src, (bytes, bytearray)) and isinstance(nick, str) and nick:
-            src_hex = src.hex()
-            self.nickname_map[src_hex] = nick
-            if room == self.active_room and room in self.room_users:
-                self.room_users[room].add(src_hex)
-                self._update_user_list()
+            src_key = bytes(src)
+            changed = self._set_nickname(src_key, nick)
+            if room == state.active_room:
+                users = state.room_users.get(room)
+                if users is not None and src_key not in users:
+                    users.add(src_key)
+                    changed = True
+            if changed:
+                self._mark_userlist_dirty()
 
         user = self._format_user(src)
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = _get_timestamp()
 
+        own_bytes = state.own_identity_bytes
         is_own = (
-            isinstance(src, (bytes, bytearray))
-            and self.own_identity_hash
-            and src.hex() == self.own_identity_hash
+            own_bytes is not None
+            and isinstance(src, (bytes, bytearray))
+            and src == own_bytes
         )
 
         mid = env.get(K_ID)
@@ -1577,44 +2044,22 @@ class MainFrame(wx.Frame):
         if is_own:
             pending = None
             if isinstance(mid, (bytes, bytearray)):
-                pending = self.pending_messages.pop(bytes(mid), None)
-
-            if pending and target_room in self.room_messages:
-                pending_room, pending_text, _pending_sent, pending_index = pending
-                messages = self.room_messages[target_room]
-
-                message_index: int | None = None
-                if isinstance(pending_index, int) and 0 <= pending_index < len(
-                    messages
-                ):
-                    msg_text, msg_color, _msg_bold, msg_italic = messages[pending_index]
-                    if (
-                        msg_italic
-                        and msg_color == self.COLOR_SYSTEM
-                        and pending_text in msg_text
-                    ):
-                        message_index = pending_index
-
-                if message_index is None:
-                    for i in range(len(messages) - 1, -1, -1):
-                        msg_text, msg_color, _msg_bold, msg_italic = messages[i]
-                        if (
-                            msg_italic
-                            and msg_color == self.COLOR_SYSTEM
-                            and pending_text in msg_text
-                        ):
-                            message_index = i
-                            break
-
+                pending = state.pending_messages.pop(bytes(mid), None)
+                if pending:
+                    self._update_status_display()
+
+            if pending:
+                pending_room, pending_text, _pending_sent = pending
+                message_index = self._take_pending_placeholder(
+                    pending_room, bytes(mid), pending_text
+                )
                 if message_index is not None:
-                    messages[message_index] = (
+                    state.room_messages[pending_room].replace(
+                        message_index,
                         f"[{timestamp}] [{room}] {user}: {body}\n",
-                        self.COLOR_OWN_MESSAGE,
-                        False,
-                        False,
+                        self._encode_style(self.COLOR_OWN_MESSAGE, False, False),
                     )
-                    if target_room == self.active_room:
-                        self._reload_room_messages()
+                    self._rewrite_message(pending_room, message_index)
                     return
 
             self._append_styled_message(
@@ -1629,20 +2074,25 @@ class MainFrame(wx.Frame):
 
     def _on_notice(self, env: dict):
         """Handle incoming notice."""
+        state = self.state
         room = env.get(K_ROOM, "?")
         src = env.get(K_SRC, b"")
         body = env.get(K_BODY, "")
 
         nick = env.get(K_NICK)
         if isinstance(src, (bytes, bytearray)) and isinstance(nick, str) and nick:
-            src_hex = src.hex()
-            self.nickname_map[src_hex] = nick
-            if room == self.active_room and room in self.room_users:
-                self.room_users[room].add(src_hex)
-                self._update_user_list()
+            src_key = bytes(src)
+            changed = self._set_nickname(src_key, nick)
+            if room == state.active_room:
+                users = state.room_users.get(room)
+                if users is not None and src_key not in users:
+                    users.add(src_key)
+                    changed = True
+            if changed:
+                self._mark_userlist_dirty()
 
         user = self._format_user(src)
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = _get_timestamp()
 
         target_room = room if room and room != "?" else self.HUB_ROOM
 
@@ -1656,12 +2106,13 @@ class MainFrame(wx.Frame):
         """Handle incoming error."""
         room = env.get(K_ROOM, "?")
         body = env.get(K_BODY, "")
-        timestamp = datetime.now().strftime("%H:%M:%S")
 
-        if body == "HELLO already sent":
-            print("[DEBUG] Ignoring expected HELLO retry error")
+        if isinstance(body, str) and body in _IGNORED_ERROR_BODIES:
+            print(f"[DEBUG] Ignoring expected error: {body}")
             return
 
+        timestamp = _get_timestamp()
+
         target_room = room if room and room != "?" else self.HUB_ROOM
 
         self._append_styled_message(
@@ -1682,48 +2133,48 @@ class MainFrame(wx.Frame):
     def _on_pong(self, env: dict):
         """Handle PONG response from hub."""
         if self.last_ping_time:
-            latency = int((time.time() - self.last_ping_time) * 1000)
+            latency = int((time.monotonic() - self.last_ping_time) * 1000)
             self.latency_ms = latency
             self.last_ping_time = None
             self._update_status_display()
 
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self._append_styled_message(
+            timestamp = _get_timestamp()
+            self._sysmsg(
                 f"[{timestamp}] PONG received - latency: {latency}ms\n",
-                color=self.COLOR_SYSTEM,
-                italic=True,
-                room=self.active_room,
+                room=self.state.active_room,
             )
 
     def _on_welcome(self, env: dict):
         """Handle WELCOME message."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = _get_timestamp()
         hub_name = None
         greeting = None
         body = env.get(K_BODY)
         if isinstance(body, dict):
             hub = body.get(B_WELCOME_HUB)
-            if isinstance(hub, str) and hub.strip():
-                hub_name = hub.strip()
+            if isinstance(hub, str):
+                hub_name = hub.strip() or None
             g = body.get(B_WELCOME_GREETING)
             if isinstance(g, str) and g.strip():
                 greeting = g
 
         hub_txt = f" ({hub_name})" if hub_name else ""
-        self._append_styled_message(
-            f"[{timestamp}] *** WELCOME - Connected to hub{hub_txt} ***\n",
-            color=self.COLOR_SYSTEM,
-            italic=True,
-            room=self.HUB_ROOM,
-        )
+        self._sysmsg(_TPL_WELCOME % (timestamp, hub_txt), room=self.HUB_ROOM)
 
         if greeting:
-            self._append_styled_message(
-                f"[{timestamp}] *** {greeting}\n",
-                color=self.COLOR_SYSTEM,
-                italic=True,
-                room=self.HUB_ROOM,
-            )
+            self._sysmsg(_TPL_GREETING % (timestamp, greeting), room=self.HUB_ROOM)
+
+    @staticmethod
+    def _extract_user_list(body) -> list:
+        """Return the member hash list from a JOINED/PARTED body.
+
+        Hubs send either a bare list or a map keyed by B_JOINED_USERS;
+        anything else yields an empty list.
+        """
+        if isinstance(body, dict):
+            user_list = body.get(B_JOINED_USERS)
+            return user_list if isinstance(user_list, list) else []
+        return body if isinstance(body, list) else []
 
     def _on_joined(self, room: str, env: dict):
         """Handle JOINED confirmation.
@@ -1732,73 +2183,58 @@ class MainFrame(wx.Frame):
         - When YOU join: body contains list of all existing members
         - When SOMEONE ELSE joins: body contains their hash (single-element list)
         """
-        timestamp = datetime.now().strftime("%H:%M:%S")
-
-        body = env.get(K_BODY)
-        logger.debug(f"JOINED room={room}, body type={type(body)}, body={body}")
-
-        user_list = None
-        if isinstance(body, dict):
-            user_list = body.get(B_JOINED_USERS)
-            logger.debug(f"Body is dict, user_list={user_list}")
-        elif isinstance(body, list):
-            user_list = body
-            logger.debug(f"Body is list directly, user_list={user_list}")
+        timestamp = _get_timestamp()
 
-        if not isinstance(user_list, list):
-            user_list = []
+        user_list = self._extract_user_list(env.get(K_BODY))
 
-        already_in_room = room in self.room_users
+        already_in_room = room in self.state.room_users
+        if already_in_room and not user_list:
+            return
 
         if not already_in_room:
-            if self.room_list.FindString(room) == wx.NOT_FOUND:
-                self.room_list.Append(room)
-
-            if room not in self.room_messages:
-                self.room_messages[room] = []
-
-            members = set()
-            for member_hash in user_list:
-                if isinstance(member_hash, (bytes, bytearray)):
-                    members.add(member_hash.hex())
-                    logger.debug(f"Added user: {member_hash.hex()[:16]}...")
-            self.room_users[room] = members
+            if room not in self._room_index:
+                self._append_room_entry(room)
 
-            if self.own_identity_hash:
-                self.room_users[room].add(self.own_identity_hash)
+            if self.state.room_messages.get(room) is None:
+                self.state.room_messages[room] = RoomHistory()
 
-            member_count = len(self.room_users.get(room, set()))
-            self._append_styled_message(
-                f"[{timestamp}] *** JOINED {room} ({member_count} user{'s' if member_count != 1 else ''}) ***\n",
-                color=self.COLOR_SYSTEM,
-                italic=True,
+            members = {
+                bytes(member_hash)
+                for member_hash in user_list
+                if isinstance(member_hash, (bytes, bytearray))
+            }
+            if self.state.own_identity_bytes:
+                members.add(self.state.own_identity_bytes)
+            self.state.room_users[room] = members
+
+            member_count = len(members)
+            self._sysmsg(
+                _TPL_JOINED
+                % (timestamp, room, member_count, "s" if member_count != 1 else ""),
                 room=room,
             )
 
-            if self.active_room == self.HUB_ROOM:
+            if self.state.active_room == self.HUB_ROOM:
                 self._set_active_room(room)
-            elif self.active_room == room:
-                self._update_user_list()
+            elif self.state.active_room == room:
+                self._mark_userlist_dirty()
         else:
-            if len(user_list) > 0:
-                user_hash = user_list[0]
-                if isinstance(user_hash, (bytes, bytearray)):
-                    user_hex = user_hash.hex()
-                    user_formatted = self._format_user(user_hash)
-
-                    if room not in self.room_users:
-                        self.room_users[room] = set()
-                    self.room_users[room].add(user_hex)
+            user_hash = user_list[0]
+            if not isinstance(user_hash, (bytes, bytearray)):
+                return
+            user_key = bytes(user_hash)
+            users = self.state.room_users[room]
+            if user_key in users:
+                return
+            users.add(user_key)
 
-                    self._append_styled_message(
-                        f"[{timestamp}] *** {user_formatted} joined {room} ***\n",
-                        color=self.COLOR_SYSTEM,
-                        italic=True,
-                        room=room,
-                    )
+            self._sysmsg(
+                _TPL_MEMBER_JOINED % (timestamp, self._format_user(user_hash), room),
+                room=room,
+            )
 
-                    if self.active_room == room:
-                        self._update_user_list()
+            if self.state.active_room == room:
+                self._mark_userlist_dirty()
 
     def _on_parted(self, room: str, env: dict):
         """Handle PARTED confirmation.
@@ -1808,100 +2244,86 @@ class MainFrame(wx.Frame):
         containing only the departing user's identity hash (single-element list).
         """
         try:
-            timestamp = datetime.now().strftime("%H:%M:%S")
+            timestamp = _get_timestamp()
 
             body = env.get(K_BODY)
-            logger.debug(f"PARTED room={room}, body type={type(body)}, body={body}")
-            logger.debug(f"Own identity hash: {self.own_identity_hash}")
-
-            user_list = None
-            if isinstance(body, dict):
-                user_list = body.get(B_JOINED_USERS)
-                logger.debug(f"Body is dict, user_list={user_list}")
-            elif isinstance(body, list):
-                user_list = body
-                logger.debug(f"Body is list directly, user_list={user_list}")
-
-            if not isinstance(user_list, list):
-                user_list = []
-                logger.warning(f"PARTED body is not a list: {body}")
+            user_list = self._extract_user_list(body)
+            if not user_list and not isinstance(body, list):
+                logger.warning("PARTED body is not a list: %r", body)
+                # A missing or empty body still means we left the room;
+                # only bodies of an unusable type are dropped.
+                if body is not None and not isinstance(body, dict):
+                    return
 
             if len(user_list) == 1:
-                user_hash = user_list[0]
+                (user_hash,) = user_list
                 if isinstance(user_hash, (bytes, bytearray)):
-                    user_hex = user_hash.hex()
-                    logger.debug(f"Parting user hash: {user_hex}, is_us: {user_hex == self.own_identity_hash}")
-                    
-                    if user_hex == self.own_identity_hash:
+                    user_key = bytes(user_hash)
+                    is_us = user_key == self.state.own_identity_bytes
+                    if _DEBUG_EVENTS:
+                        logger.debug(
+                            "Parting user hash: %s, is_us: %s",
+                            user_key.hex(),
+                            is_us,
+                        )
+
+                    if is_us:
                         logger.info(f"We parted from room: {room} (new spec)")
-                        idx = self.room_list.FindString(room)
-                        logger.debug(f"Room list index for '{room}': {idx}")
-                        if idx != wx.NOT_FOUND:
-                            self.room_list.Delete(idx)
-                            logger.debug(f"Deleted room from list at index {idx}")
+                        idx = self._delete_room_entry(room)
+                        if idx is not None:
+                            if _DEBUG_EVENTS:
+                                logger.debug("Deleted room from list at index %d", idx)
                         else:
                             logger.warning(f"Room '{room}' not found in room_list!")
 
-                        self._append_styled_message(
-                            f"[{timestamp}] *** PARTED {room} ***\n",
-                            color=self.COLOR_SYSTEM,
-                            italic=True,
-                            room=room,
-                        )
+                        self._sysmsg(_TPL_PARTED % (timestamp, room), room=room)
 
-                        if self.active_room == room:
+                        if self.state.active_room == room:
                             self._set_active_room(self.HUB_ROOM)
 
-                        if room in self.room_users:
-                            del self.room_users[room]
-                        
-                        if room in self.room_messages:
-                            del self.room_messages[room]
+                        self.state.room_users.pop(room, None)
+                        self.state.room_messages.pop(room, None)
+                        self.state.pending_index.pop(room, None)
                     else:
-                        logger.debug(f"User {user_hex[:16]}... parted from room: {room} (new spec)")
-                        user_formatted = self._format_user(user_hash)
-
-                        if room in self.room_users:
-                            self.room_users[room].discard(user_hex)
-
-                        self._append_styled_message(
-                            f"[{timestamp}] *** {user_formatted} left {room} ***\n",
-                            color=self.COLOR_SYSTEM,
-                            italic=True,
+                        if _DEBUG_EVENTS:
+                            logger.debug(
+                                "User %s... parted from room: %s (new spec)",
+                                user_key[:8].hex(),
+                                room,
+                            )
+                        users = self.state.room_users.get(room)
+                        if users is None or user_key not in users:
+                            return
+                        users.remove(user_key)
+
+                        self._sysmsg(
+                            _TPL_MEMBER_LEFT
+                            % (timestamp, self._format_user(user_hash), room),
                             room=room,
                         )
 
-                        if self.active_room == room:
-                            self._update_user_list()
+                        if self.state.active_room == room:
+                            self._mark_userlist_dirty()
             else:
                 user_hashes_in_body = set()
                 for user_hash in user_list:
                     if isinstance(user_hash, (bytes, bytearray)):
-                        user_hashes_in_body.add(user_hash.hex())
-                
-                we_are_in_body = self.own_identity_hash in user_hashes_in_body
-                
+                        user_hashes_in_body.add(bytes(user_hash))
+
+                we_are_in_body = self.state.own_identity_bytes in user_hashes_in_body
+
                 if not we_are_in_body:
                     logger.info(f"We parted from room: {room} (old spec, {len(user_list)} remaining)")
-                    idx = self.room_list.FindString(room)
-                    if idx != wx.NOT_FOUND:
-                        self.room_list.Delete(idx)
+                    self._delete_room_entry(room)
 
-                    self._append_styled_message(
-                        f"[{timestamp}] *** PARTED {room} ***\n",
-                        color=self.COLOR_SYSTEM,
-                        italic=True,
-                        room=room,
-                    )
+                    self._sysmsg(_TPL_PARTED % (timestamp, room), room=room)
 
-                    if self.active_room == room:
+                    if self.state.active_room == room:
                         self._set_active_room(self.HUB_ROOM)
 
-                    if room in self.room_users:
-                        del self.room_users[room]
-                    
-                    if room in self.room_messages:
-                        del self.room_messages[room]
+                    self.state.room_users.pop(room, None)
+                    self.state.room_messages.pop(room, None)
+                    self.state.pending_index.pop(room, None)
                 else:
                     logger.warning(f"PARTED with multiple users ({len(user_list)}) but we're in the list - unexpected")
         except Exception as e:
@@ -1913,25 +2335,23 @@ class MainFrame(wx.Frame):
 
     def _handle_disconnect(self):
         """Handle disconnect in main thread."""
-        self.client = None
-        self.is_connecting = False
+        self.state.client = None
+        self.state.is_connecting = False
 
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self._append_styled_message(
-            f"[{timestamp}] *** DISCONNECTED ***\n",
-            color=self.COLOR_SYSTEM,
-            italic=True,
-            room=self.HUB_ROOM,
-        )
+        timestamp = _get_timestamp()
+        self._sysmsg(_TPL_DISCONNECTED % timestamp, room=self.HUB_ROOM)
 
-        while self.room_list.GetCount() > 1:
-            self.room_list.Delete(1)
+        self.room_list.Freeze()
+        try:
+            self._reset_room_entries()
+        finally:
+            self.room_list.Thaw()
 
-        for room in list(self.room_users.keys()):
-            del self.room_users[room]
+        self.state.room_users.clear()
 
-        self.pending_messages.clear()
-        self._set_active_room(self.HUB_ROOM)
+        self.state.pending_messages.clear()
+        self.state.pending_index.clear()
+        self._set_active_room(self.HUB_ROOM, force=True)
         self._set_controls_enabled(False)
         self.connect_menu_item.Enable(True)
         self.disconnect_menu_item.Enable(False)
@@ -2,16 +2,70 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
 import logging.handlers
+import os
 import sys
+from collections import deque
 from collections.abc import Callable
 from pathlib import Path
 
+_TAIL_BLOCK_SIZE = 8192
+# Records buffered in memory before a batched write to the log file.
+_LOG_BUFFER_CAPACITY = 1024
+
+# Modules that cache "is DEBUG enabled" in a module-level _DEBUG_ENABLED flag
+# so their hot paths can skip logger.debug() calls entirely.
+_DEBUG_GATED_MODULES = (f"{__package__}.client",)
+
+
+def _refresh_debug_gates() -> None:
+    """Re-resolve cached DEBUG flags after the log level changes."""
+    for name in _DEBUG_GATED_MODULES:
+        module = sys.modules.get(name)
+        if module is not None:
+            module._DEBUG_ENABLED = logging.getLogger(name).isEnabledFor(logging.DEBUG)
+
+
+class AmortizedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that only checks the file size periodically.
+
+    The stock handler inspects the log file on every emit. This one defers
+    the check until roughly an eighth of ``maxBytes`` has been logged since
+    the last one, so a file may overshoot ``maxBytes`` by about that much
+    before rotating.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the handler; accepts RotatingFileHandler's arguments."""
+        super().__init__(*args, **kwargs)
+        self._bytes_since_check = 0
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        """Determine if rollover should occur, checking the file lazily.
+
+        Args:
+            record: Log record about to be written
+
+        Returns:
+            True if the log file should be rotated before writing
+        """
+        if self.maxBytes <= 0:
+            return False
+        self._bytes_since_check += len(record.getMessage())
+        if self._bytes_since_check <= self.maxBytes // 8:
+            return False
+        self._bytes_since_check = 0
+        return bool(super().shouldRollover(record))
+
 
 class LogManager:
     """Manages application logging configuration."""
 
+    # Directories already created by an earlier instance in this process.
+    _ensured: set[Path] = set()
+
     def __init__(self, app_dir: Path | None = None):
         """Initialize log manager.
 
@@ -20,9 +74,13 @@ class LogManager:
                      Defaults to ~/.rrc-gui
         """
         self.app_dir = app_dir or Path.home() / ".rrc-gui"
-        self.app_dir.mkdir(parents=True, exist_ok=True)
         self.log_dir = self.app_dir / "logs"
-        self.log_dir.mkdir(parents=True, exist_ok=True)
+        for directory in (self.app_dir, self.log_dir):
+            if directory not in LogManager._ensured:
+                directory.mkdir(parents=True, exist_ok=True)
+                LogManager._ensured.add(directory)
+        self._buffered_handler: logging.handlers.MemoryHandler | None = None
+        self._flush_at_exit = False
 
     def setup_logging(
         self,
@@ -48,7 +106,14 @@ class LogManager:
         root_logger = logging.getLogger()
         root_logger.setLevel(numeric_level)
 
+        for handler in root_logger.handlers:
+            # MemoryHandler.close() flushes but leaves its target open.
+            target = getattr(handler, "target", None)
+            handler.close()
+            if isinstance(target, logging.Handler):
+                target.close()
         root_logger.handlers.clear()
+        self._buffered_handler = None
 
         if format_string is None:
             format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -63,17 +128,29 @@ class LogManager:
 
         if log_to_file:
             log_file = self.log_dir / "rrc-gui.log"
-            file_handler = logging.handlers.RotatingFileHandler(
+            file_handler = AmortizedRotatingFileHandler(
                 log_file,
                 maxBytes=max_bytes,
                 backupCount=backup_count,
                 encoding="utf-8",
             )
-            file_handler.setLevel(numeric_level)
             file_handler.setFormatter(formatter)
-            root_logger.addHandler(file_handler)
+            # Batch writes to the file; errors and shutdown flush immediately.
+            buffered = logging.handlers.MemoryHandler(
+                capacity=_LOG_BUFFER_CAPACITY,
+                flushLevel=logging.ERROR,
+                target=file_handler,
+                flushOnClose=True,
+            )
+            buffered.setLevel(numeric_level)
+            root_logger.addHandler(buffered)
+            self._buffered_handler = buffered
+            if not self._flush_at_exit:
+                atexit.register(self.flush)
+                self._flush_at_exit = True
 
         logging.getLogger("RNS").setLevel(logging.WARNING)
+        _refresh_debug_gates()
 
     def get_log_file_path(self) -> Path:
         """Get path to the main log file.
@@ -90,12 +167,15 @@ class LogManager:
             List of log file paths, newest first
         """
         try:
-            log_files = sorted(
-                self.log_dir.glob("rrc-gui.log*"),
-                key=lambda p: p.stat().st_mtime,
-                reverse=True,
-            )
-            return log_files
+            stamped = []
+            for log_file in self.log_dir.glob("rrc-gui.log*"):
+                try:
+                    stamped.append((log_file.stat().st_mtime, log_file))
+                except FileNotFoundError:
+                    # Rotated away between the glob and the stat.
+                    continue
+            stamped.sort(key=lambda item: item[0], reverse=True)
+            return [log_file for _mtime, log_file in stamped]
         except Exception:
             return []
 
@@ -108,6 +188,7 @@ class LogManager:
         Returns:
             Number of files deleted
         """
+        self.flush()
         deleted = 0
         try:
             for log_file in self.log_dir.glob("rrc-gui.log*"):
@@ -120,6 +201,11 @@ class LogManager:
             pass
         return deleted
 
+    def flush(self) -> None:
+        """Write any buffered log records to the log file."""
+        if self._buffered_handler is not None:
+            self._buffered_handler.flush()
+
     def get_log_level_name(self) -> str:
         """Get current log level name.
 
@@ -142,6 +228,8 @@ class LogManager:
         for handler in root_logger.handlers:
             handler.setLevel(numeric_level)
 
+        _refresh_debug_gates()
+
     def tail_log(self, lines: int = 100) -> list[str]:
         """Get the last N lines from the current log file.
 
@@ -151,13 +239,28 @@ class LogManager:
         Returns:
             List of log lines
         """
+        self.flush()
         log_file = self.get_log_file_path()
-        if not log_file.exists():
+        if lines <= 0 or not log_file.exists():
             return []
 
         try:
-            with open(log_file, encoding="utf-8") as f:
-                return f.readlines()[-lines:]
+            # Read fixed-size blocks backwards from the end until enough
+            # newlines are seen, so only the tail of a large log is read.
+            chunks: deque[bytes] = deque()
+            newlines = 0
+            with open(log_file, "rb") as f:
+                pos = f.seek(0, os.SEEK_END)
+                while pos > 0 and newlines <= lines:
+                    size = min(_TAIL_BLOCK_SIZE, pos)
+                    pos -= size
+                    f.seek(pos)
+                    chunk = f.read(size)
+                    chunks.appendleft(chunk)
+                    newlines += chunk.count(b"\n")
+
+            tail = b"".join(chunks).splitlines(keepends=True)[-lines:]
+            return [line.decode("utf-8", errors="replace") for line in tail]
         except Exception:
             return []
 
@@ -197,23 +300,39 @@ class DebugLogContext:
 class LogViewHandler(logging.Handler):
     """Custom logging handler for displaying logs in a wx widget."""
 
-    def __init__(self, callback: Callable[[str, str], None]):
+    def __init__(self, callback: Callable[[str, str], None] | None):
         """Initialize log view handler.
 
         Args:
-            callback: Function to call with formatted log records (msg, level)
+            callback: Function to call with formatted log records (msg, level),
+                      or None to start disabled
         """
         super().__init__()
         self.callback = callback
 
+    def set_callback(self, callback: Callable[[str, str], None] | None) -> None:
+        """Replace the callback that receives formatted records.
+
+        Args:
+            callback: New callback, or None to disable the handler
+        """
+        self.callback = callback
+
+    def disable(self) -> None:
+        """Stop formatting and forwarding records, e.g. when the view closes."""
+        self.callback = None
+
     def emit(self, record: logging.LogRecord) -> None:
         """Emit a log record.
 
         Args:
             record: Log record to emit
         """
+        callback = self.callback
+        if callback is None:
+            return
         try:
             msg = self.format(record)
-            self.callback(msg, record.levelname)
+            callback(msg, record.levelname)
         except Exception:
             self.handleError(record)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import contextlib
 import json
 import os
 from pathlib import Path
@@ -11,6 +12,8 @@ from typing import Any
 class StateManager:
     """Manages application state persistence."""
 
+    __slots__ = ("app_dir", "_input_history")
+
     def __init__(self, app_dir: Path | None = None):
         """Initialize state manager.
 
@@ -20,6 +23,8 @@ class StateManager:
         """
         self.app_dir = app_dir or Path.home() / ".rrc-gui"
         self.app_dir.mkdir(parents=True, exist_ok=True)
+        # In-memory copy of input_history.json, loaded on first use.
+        self._input_history: dict[str, list[str]] | None = None
 
     def get_state_file(self, name: str) -> Path:
         """Get path to a state file.
@@ -55,6 +60,9 @@ class StateManager:
     def save_state(self, name: str, data: Any) -> bool:
         """Save state to a file.
 
+        The data is written compactly to a temporary file that then replaces
+        the state file, so a crash mid-write leaves the previous state intact.
+
         Args:
             name: Name of the state file (without .json extension)
             data: Data to save (must be JSON-serializable)
@@ -63,12 +71,16 @@ class StateManager:
             True if successful, False otherwise
         """
         state_file = self.get_state_file(name)
+        tmp_file = state_file.with_name(state_file.name + ".tmp")
         try:
-            with open(state_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-            os.chmod(state_file, 0o600)
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_file, state_file)
             return True
         except Exception:
+            with contextlib.suppress(OSError):
+                tmp_file.unlink()
             return False
 
     def delete_state(self, name: str) -> bool:
@@ -96,7 +108,12 @@ class StateManager:
             List of state file names (without .json extension)
         """
         try:
-            return [f.stem for f in self.app_dir.glob("*.json") if f.is_file()]
+            with os.scandir(self.app_dir) as entries:
+                return [
+                    entry.name[:-5]
+                    for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file()
+                ]
         except Exception:
             return []
 
@@ -150,6 +167,13 @@ class StateManager:
 
         return self.save_state("window_state", current)
 
+    def _load_input_history(self) -> dict[str, list[str]]:
+        """Return the cached input history for all rooms, loading it once."""
+        if self._input_history is None:
+            all_history = self.load_state("input_history", {})
+            self._input_history = all_history if isinstance(all_history, dict) else {}
+        return self._input_history
+
     def get_input_history(self, room: str) -> list[str]:
         """Get input history for a room.
 
@@ -159,11 +183,8 @@ class StateManager:
         Returns:
             List of previous inputs
         """
-        all_history = self.load_state("input_history", {})
-        if isinstance(all_history, dict):
-            result = all_history.get(room, [])
-            return result if isinstance(result, list) else []
-        return []
+        result = self._load_input_history().get(room, [])
+        return list(result) if isinstance(result, list) else []
 
     def save_input_history(self, room: str, history: list[str]) -> bool:
         """Save input history for a room.
@@ -175,9 +196,15 @@ class StateManager:
         Returns:
             True if successful, False otherwise
         """
-        all_history = self.load_state("input_history", {})
-        all_history[room] = history
-        return self.save_state("input_history", all_history)
+        all_history = self._load_input_history()
+        if all_history.get(room) == history:
+            return True
+        # Only cache what was actually written, so a failed save is retried.
+        updated = {**all_history, room: list(history)}
+        if not self.save_state("input_history", updated):
+            return False
+        self._input_history = updated
+        return True
 
     def clear_input_history(self, room: str | None = None) -> bool:
         """Clear input history.
@@ -189,10 +216,16 @@ class StateManager:
             True if successful, False otherwise
         """
         if room is None:
-            return self.delete_state("input_history")
+            deleted = self.delete_state("input_history")
+            # On failure, reload from disk next time rather than guess.
+            self._input_history = {} if deleted else None
+            return deleted
 
-        all_history = self.load_state("input_history", {})
-        if room in all_history:
-            del all_history[room]
-            return self.save_state("input_history", all_history)
-        return False
+        all_history = self._load_input_history()
+        if room not in all_history:
+            return False
+        updated = {r: h for r, h in all_history.items() if r != room}
+        if not self.save_state("input_history", updated):
+            return False
+        self._input_history = updated
+        return True
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 import wx
 
 
@@ -9,17 +11,22 @@ def is_dark_mode() -> bool:
     """Detect if the system is using a dark theme."""
     # Get system background color
     bg_color = wx.SystemSettings.GetColour(wx.SYS_COLOUR_WINDOW)
-    # Calculate luminance (perceived brightness)
-    # Formula: Y = 0.299*R + 0.587*G + 0.114*B
+    # Calculate luminance (perceived brightness) in 8.8 fixed point
+    # Formula: Y = 0.299*R + 0.587*G + 0.114*B ~= (77*R + 150*G + 29*B) / 256
     luminance = (
-        0.299 * bg_color.Red() + 0.587 * bg_color.Green() + 0.114 * bg_color.Blue()
-    )
+        77 * bg_color.Red() + 150 * bg_color.Green() + 29 * bg_color.Blue()
+    ) >> 8
     # If luminance < 128, it's dark mode
-    return bool(luminance < 128)
+    return luminance < 128
 
 
+@lru_cache(maxsize=1)
 def get_theme_colors() -> dict:
-    """Get color scheme based on current theme."""
+    """Get color scheme based on current theme.
+
+    The result is cached until invalidate_theme_cache() is called and is
+    shared between callers, so it must not be modified.
+    """
     if is_dark_mode():
         # Dark mode: use lighter, more vibrant colors
         return {
@@ -36,3 +43,8 @@ def get_theme_colors() -> dict:
             "error": wx.RED,  # Red
             "system": wx.Colour(128, 128, 128),  # Gray
         }
+
+
+def invalidate_theme_cache() -> None:
+    """Forget the cached theme colors, e.g. after the system colors change."""
+    get_theme_colors.cache_clear()
@@ -13,6 +13,13 @@ MAX_MESSAGES_PER_ROOM = 1000
 # Timeout for pending messages (seconds) - mark as failed after this
 PENDING_MESSAGE_TIMEOUT = 30.0
 
+# Housekeeping timer cadences (milliseconds)
+PENDING_CHECK_INTERVAL_MS = 5000
+STATUS_UPDATE_INTERVAL_MS = 1000
+
+# Delay before a membership change redraws the user list (milliseconds)
+USER_LIST_REFRESH_DELAY_MS = 100
+
 # Connection timeout (seconds)
 CONNECTION_TIMEOUT = 30.0
 
@@ -3,25 +3,58 @@
 from __future__ import annotations
 
 import os
+import time
+from functools import lru_cache
 from pathlib import Path
 
 import RNS
 
+# Characters dropped from display names: C0 controls, DEL and the
+# U+FFFE/U+FFFF noncharacters. Used with str.translate.
+_DISPLAY_NAME_DROP = dict.fromkeys([*range(32), 0x7F, 0xFFFE, 0xFFFF])
+
+# Last (epoch second, formatted time) returned by get_timestamp().
+_ts_cache: tuple[int, str] = (-1, "")
+
+
+def get_timestamp() -> str:
+    """Return the current local time as HH:MM:SS.
+
+    The formatted string is reused for every call within the same second.
+    """
+    global _ts_cache
+    now = int(time.time())
+    if _ts_cache[0] != now:
+        _ts_cache = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+    return _ts_cache[1]
+
 
 def expand_path(p: str) -> str:
     """Expand ~ and environment variables in path."""
+    if "~" not in p and "$" not in p and "%" not in p:
+        return p
     return os.path.expanduser(os.path.expandvars(p))
 
 
+@lru_cache(maxsize=4)
+def _load_identity_file(path: str, mtime_ns: int, size: int) -> RNS.Identity | None:
+    """Load an identity file, memoized on its stat so a changed file is reread."""
+    return RNS.Identity.from_file(path)
+
+
 def load_or_create_identity(path: str) -> RNS.Identity:
     """Load identity from file or create a new one."""
     identity_path = Path(expand_path(path))
-    identity_path.parent.mkdir(parents=True, exist_ok=True)
-    if identity_path.exists():
-        ident = RNS.Identity.from_file(str(identity_path))
+    try:
+        st = identity_path.stat()
+    except FileNotFoundError:
+        st = None
+    if st is not None:
+        ident = _load_identity_file(str(identity_path), st.st_mtime_ns, st.st_size)
         if ident is None:
             raise RuntimeError(f"Failed to load identity from {identity_path}")
         return ident
+    identity_path.parent.mkdir(parents=True, exist_ok=True)
     ident = RNS.Identity()
     ident.to_file(str(identity_path))
     try:
@@ -62,12 +95,7 @@ def sanitize_display_name(name: str, max_length: int = 64) -> str | None:
     if len(sanitized) > max_length:
         sanitized = sanitized[:max_length]
 
-    cleaned = ""
-    for char in sanitized:
-        code = ord(char)
-        if code < 32 or code == 0x7F or code == 0xFFFE or code == 0xFFFF:
-            continue
-        cleaned += char
+    cleaned = sanitized.translate(_DISPLAY_NAME_DROP)
 
     if not cleaned:
         return None